@@ -59,6 +59,8 @@ const hackathonSchema = new mongoose.Schema({
     views: { type: Number, default: 0 },
     source: String,
     scraped_at: Date,
+    // Fields the scraper guessed because the listing left them out
+    estimatedFields: [String],
 
     addedToRounds: {
         type: Boolean,
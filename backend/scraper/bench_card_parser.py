@@ -0,0 +1,71 @@
+"""
+Micro-benchmark for CardParser against the per-call regex approach it replaced.
+
+Usage: python bench_card_parser.py [iterations]
+"""
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+from hackscraper.parsing import CARD_PARSER, CATEGORIES_MAP
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'card_texts.json')
+
+def load_corpus(path=FIXTURE_PATH):
+    """Load the fixture card texts"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+# The unanchored location patterns the parser used to run
+BASELINE_LOCATION_PATTERNS = [
+    r'([A-Za-z\s]+(?:University|Institute|College|IIT|NIT|IIIT)[A-Za-z\s,]*)',
+    r'([A-Za-z\s]+,\s*[A-Za-z\s]+)',
+]
+
+def baseline_parse(text):
+    """The previous extraction: one re.search per field and a substring category scan"""
+    days_match = re.search(r'(\d+)\s*days?\s*left', text, re.IGNORECASE)
+    deadline = None
+    if days_match:
+        deadline = (datetime.now() + timedelta(days=int(days_match.group(1)))).strftime('%Y-%m-%d')
+        datetime.strptime(deadline, '%Y-%m-%d')
+    prize_match = re.search(r'₹([\d,]+)', text)
+    location = None
+    for pattern in BASELINE_LOCATION_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            location = re.sub(r'\s+', ' ', match.group(1).strip())
+            break
+    for pattern in (r'team\s*size:?\s*(\d+)\s*-?\s*(\d+)?', r'(\d+)\s*-?\s*(\d+)?\s*members?'):
+        if re.search(pattern, text, re.IGNORECASE):
+            break
+    any(word in text.lower() for word in ['closed', 'ended', 'finished'])
+    card_lower = text.lower()
+    for keyword in CATEGORIES_MAP:
+        if keyword in card_lower:
+            break
+    return deadline, prize_match, location
+
+def run(parse, corpus, iterations):
+    """Return microseconds per card for parse over the corpus"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for text in corpus:
+            parse(text)
+    elapsed = time.perf_counter() - started
+    return elapsed / (iterations * len(corpus)) * 1e6
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    corpus = load_corpus()
+    baseline = run(baseline_parse, corpus, iterations)
+    parser = run(CARD_PARSER.parse, corpus, iterations)
+    print(json.dumps({
+        'cards': len(corpus) * iterations,
+        'baseline_us_per_card': round(baseline, 2),
+        'card_parser_us_per_card': round(parser, 2),
+        'speedup': round(baseline / parser, 2)
+    }, indent=2))
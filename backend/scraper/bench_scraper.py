@@ -0,0 +1,10 @@
+"""
+Compatibility shim: the offline benchmark now lives in hackscraper.bench
+(`python -m hackscraper bench`).
+"""
+import sys
+
+from hackscraper.bench import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Hackathon scraper package.
+
+Submodules are imported on first use, so `import hackscraper` is cheap and
+`hackscraper.<name>` finds a public name in whichever submodule defines it:
+
+- parsing: card/API parsing, document builders and the parse stage
+- dedupe: URL canonicalisation, near-duplicate titles and fingerprints
+- storage: MongoDB writes, the snapshot export and status recomputation
+- metrics: per-run ScrapeMetrics
+- browser: Playwright fetching, readiness, selectors and profiles
+- sources: the Source registry
+- enrich: detail-page enrichment
+- pipeline: the streaming scrape pipeline
+- daemon: interval scraping with a /health endpoint
+- dataset_export: gzip JSON Lines history and columnar snapshots
+- cli: `python -m hackscraper <command>`
+"""
+import importlib
+import os
+
+# Lightest first, so a name lookup loads as little as possible
+SUBMODULES = (
+    'parsing', 'dedupe', 'metrics', 'storage', 'dataset_export', 'browser',
+    'sources', 'enrich', 'pipeline', 'daemon'
+)
+
+def _load_env():
+    """Load the nearest .env above this package, importing python-dotenv only when there is one"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, '.env')
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
+
+# Load environment variables before any submodule reads its settings
+_load_env()
+
+def __getattr__(name):
+    if name in SUBMODULES or name == 'cli':
+        return importlib.import_module(f"{__name__}.{name}")
+    if not name.startswith('_'):
+        for submodule in SUBMODULES:
+            module = importlib.import_module(f"{__name__}.{submodule}")
+            if hasattr(module, name):
+                return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
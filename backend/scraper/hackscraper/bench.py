@@ -0,0 +1,431 @@
+"""
+Offline end-to-end benchmark for the scraper.
+
+Serves listing HTML and listing API JSON built from the recorded fixtures
+(fixtures/api_search_result.json, fixtures/card_texts.json) at several sizes
+from a local HTTP server, runs the scrape_hackathons stages against them
+(fetch, parse, dedupe) and saves the result with save_to_mongodb. Each size
+and fetch mode runs in its own process so peak RSS is measured per run.
+
+Startup is tracked too: the import time of each STARTUP_MODULES module, and
+the time over a bare interpreter each command that must not load the
+browser stack takes to run, checked against STARTUP_BUDGET_MS. The
+commands run their real code paths against an unreachable MongoDB
+(STARTUP_MONGODB_URI, with no server selection wait): save reads a
+one-document file and fails to connect, export finds no server and no
+backup, recompute-status finds no server, and bench runs with nothing to do.
+
+--parse-workers also times the parsing stage alone (iter_parsed) on a large
+corpus of card records at each worker count, checking the output matches
+the serial run, and reports the speedup over one worker.
+
+The database is a local mongod when --mongo is given (the hackplanner_bench
+database is dropped and reused), otherwise mongomock, which
+requirements-dev.txt installs; without either the DB stage is skipped.
+
+Usage: python -m hackscraper bench [--sizes 50,500,5000] [--modes api,browser]
+                                   [--mongo URI] [--output results.json]
+                                   [--parse-workers 1,2,4] [--parse-size 50000]
+"""
+import argparse
+import contextlib
+import copy
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# The directory holding the hackscraper package and the fixtures
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_PATH = os.path.join(SCRAPER_DIR, 'fixtures', 'card_texts.json')
+API_FIXTURE_PATH = os.path.join(SCRAPER_DIR, 'fixtures', 'api_search_result.json')
+DEFAULT_SIZES = (50, 500, 5000)
+DEFAULT_MODES = ('api', 'browser')
+DEFAULT_PARSE_SIZE = 50000
+FIXTURE_API_PATH = '/api/search-result'
+BENCH_DATABASE = 'hackplanner_bench'
+
+# Startup tracking: modules timed on import, and commands expected to start
+# within the budget (scrape loads Playwright and is not held to it)
+STARTUP_MODULES = (
+    'hackscraper', 'hackscraper.cli', 'hackscraper.parsing', 'hackscraper.storage',
+    'hackscraper.dataset_export', 'hackscraper.browser', 'hackscraper.pipeline', 'unstop_scraper'
+)
+STARTUP_COMMANDS = {
+    'save': ['save', '{directory}/hackathons.jsonl'],
+    'export': ['export', '{directory}/hackathons.snapshot', '--backup', '{directory}/missing.jsonl.gz'],
+    'recompute-status': ['recompute-status'],
+    'bench': ['bench', '--sizes', '', '--no-startup']
+}
+STARTUP_MONGODB_URI = 'mongodb://127.0.0.1:1'
+STARTUP_BUDGET_MS = 100
+STARTUP_REPEATS = 3
+IMPORT_TIMER = "import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+
+def load_corpus(path=FIXTURE_PATH):
+    """Load the fixture card texts"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def load_api_items(path=API_FIXTURE_PATH):
+    """Load the recorded listing API items"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['data']['data']
+
+def build_fixture_items(size, seed=0):
+    """Deterministic listing API items, one per card, cycled from the recorded ones"""
+    rng = random.Random(seed + size)
+    recorded = load_api_items()
+    items = []
+    for i in range(size):
+        item = copy.deepcopy(recorded[i % len(recorded)])
+        # Each card gets its own title, link and dates so none dedupe away
+        shift = timedelta(days=rng.randint(0, 120))
+        for key in ('start_date', 'end_date'):
+            item[key] = _shift_date(item.get(key), shift)
+        regn = item.get('regnRequirements') or {}
+        if regn.get('end_regn_dt'):
+            regn['end_regn_dt'] = _shift_date(regn['end_regn_dt'], shift)
+        item.update({
+            'id': i,
+            'title': f"{item['title']} {i:05d}",
+            'public_url': f"hackathons/fixture-hackathon-{i}",
+            'seo_url': None
+        })
+        items.append(item)
+    return items
+
+def _shift_date(value, shift):
+    """Move an API timestamp by shift, keeping its format"""
+    if not value:
+        return value
+    day = datetime.strptime(value[:10], '%Y-%m-%d') + shift
+    return day.strftime('%Y-%m-%d') + value[10:]
+
+def render_listing_html(items, corpus):
+    """A listing page with one Unstop-style card per item"""
+    cards = []
+    for i, item in enumerate(items):
+        cards.append(
+            f'<div class="trending_card"><a href="/{item["public_url"]}">'
+            f'<h3>{item["title"]}</h3></a><p>{corpus[i % len(corpus)]}</p></div>'
+        )
+    return ('<!doctype html><html><head><title>Hackathons</title></head><body>'
+            '<div class="listing">' + ''.join(cards) + '</div></body></html>').encode('utf-8')
+
+def start_fixture_server(html, items):
+    """Serve the listing page and paginated API on a free local port"""
+    # Only the flows serve fixtures, so the startup timings skip http.server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == '/hackathons':
+                body, content_type = html, 'text/html; charset=utf-8'
+            elif parts.path == FIXTURE_API_PATH:
+                params = dict(parse_qsl(parts.query))
+                per_page = int(params.get('per_page', 18))
+                page = int(params.get('page', 1))
+                payload = {'data': {
+                    'current_page': page,
+                    'last_page': max(1, math.ceil(len(items) / per_page)),
+                    'data': items[(page - 1) * per_page:page * per_page]
+                }}
+                body, content_type = json.dumps(payload).encode('utf-8'), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+class CountingCollection:
+    """Wraps a collection, counting the calls and write operations sent to it"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.calls = 0
+        self.write_ops = 0
+
+    def bulk_write(self, requests, *args, **kwargs):
+        self.calls += 1
+        self.write_ops += len(requests)
+        return self.collection.bulk_write(requests, *args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self.collection, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return attr(*args, **kwargs)
+        return counted
+
+def open_bench_collection(scraper, mongo_uri=None):
+    """An empty, indexed hackathons collection and the name of its backend"""
+    if mongo_uri:
+        from pymongo import MongoClient
+        collection = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)[BENCH_DATABASE]['hackathons']
+        collection.drop()
+        backend = 'mongod'
+    else:
+        try:
+            import mongomock
+        except ImportError:
+            return None, None
+        collection = mongomock.MongoClient()[BENCH_DATABASE]['hackathons']
+        backend = 'mongomock'
+    scraper.ensure_indexes(collection)
+    return collection, backend
+
+def run_flow(size, mode, mongo_uri=None, batch_size=None):
+    """Benchmark one fixture size and fetch mode in this process"""
+    corpus = load_corpus()
+    items = build_fixture_items(size)
+    server = start_fixture_server(render_listing_html(items, corpus), items)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # The scraper reads its configuration at import time
+    os.environ.update({
+        'UNSTOP_API_URL': base_url + FIXTURE_API_PATH,
+        'SCRAPER_API_MAX_PAGES': str(math.ceil(size / 18) + 1),
+        'SCRAPER_SELECTOR_CACHE': 'off'
+    })
+    rss_before = peak_rss_mb()
+    import hackscraper as scraper
+
+    listing_url = base_url + '/hackathons'
+    source = scraper.UnstopSource([listing_url])
+    stages = {}
+    result = {'cards': size, 'mode': mode}
+
+    # The scraper's progress output goes to stderr so stdout stays JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        started = time.perf_counter()
+        records = [record for _, record in scraper.iter_source_records(
+            [source], fetch_mode=mode, host_interval=0, profile='lean', screenshot=False
+        )]
+        stages['fetch'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        hackathons = []
+        for record in records:
+            hackathon = scraper.normalize_hackathon(source.map_record(record), source)
+            if hackathon:
+                hackathon['contentHash'] = source.fingerprint(record)
+                hackathons.append(hackathon)
+        stages['parse'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        dedupe = scraper.DedupeIndex(ignore_urls=source.ignore_urls())
+        hackathons = [h for h in hackathons if dedupe.add(h)]
+        stages['dedupe'] = time.perf_counter() - started
+
+        collection, backend = open_bench_collection(scraper, mongo_uri)
+        if collection is not None:
+            counting = CountingCollection(collection)
+            started = time.perf_counter()
+            saved = scraper.save_to_mongodb(hackathons, batch_size, collection=counting)
+            stages['db_write'] = time.perf_counter() - started
+            result['db'] = {
+                'backend': backend,
+                'saved': saved,
+                'round_trips': counting.calls,
+                'write_ops': counting.write_ops
+            }
+        else:
+            result['db'] = {'backend': None, 'skipped': 'pass --mongo or pip install -r requirements-dev.txt'}
+
+    server.shutdown()
+    total = sum(stages.values())
+    result.update({
+        'records_fetched': len(records),
+        'hackathons': len(hackathons),
+        'stages_s': {name: round(seconds, 4) for name, seconds in stages.items()},
+        'total_s': round(total, 4),
+        'cards_per_s': round(len(records) / total, 1) if records and total else 0,
+        'rss_before_mb': rss_before,
+        'peak_rss_mb': peak_rss_mb()
+    })
+    if not records:
+        result['error'] = 'no records fetched'
+    return result
+
+def build_card_records(size, corpus):
+    """Deterministic raw records in the shape the browser extraction emits"""
+    records = []
+    for i in range(size):
+        title = f"Fixture Hackathon {i:05d}"
+        records.append({
+            'text': f"{title}\n{corpus[i % len(corpus)]}",
+            'titles': [title],
+            'href': f"/hackathons/fixture-hackathon-{i}",
+            'page_url': 'https://unstop.com/hackathons'
+        })
+    return records
+
+def run_parse_scaling(size, worker_counts, chunk_size=None):
+    """Time the parsing stage alone at each worker count"""
+    os.environ['SCRAPER_SELECTOR_CACHE'] = 'off'
+    import hackscraper as scraper
+    
+    source = scraper.UnstopSource(['https://unstop.com/hackathons'])
+    items = [(source, record) for record in build_card_records(size, load_corpus())]
+    runs = []
+    baseline = None
+    for workers in worker_counts:
+        with contextlib.redirect_stdout(sys.stderr):
+            started = time.perf_counter()
+            parsed = [hackathon for _, hackathon, _ in scraper.iter_parsed(items, workers, chunk_size)]
+            seconds = time.perf_counter() - started
+        # scraped_at differs between runs; everything else must match
+        titles = [h and (h['title'], h['status'], h['category']) for h in parsed]
+        if baseline is None:
+            baseline = (seconds, titles)
+        runs.append({
+            'workers': workers,
+            'total_s': round(seconds, 4),
+            'cards_per_s': round(size / seconds, 1),
+            'speedup': round(baseline[0] / seconds, 2),
+            'matches_first': titles == baseline[1]
+        })
+    return {'cards': size, 'chunk_size': chunk_size or scraper.PARSE_CHUNK, 'cpus': os.cpu_count(), 'runs': runs}
+
+def git_commit():
+    """The current commit hash, when run from a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=SCRAPER_DIR, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_isolated(size, mode, args):
+    """Run one flow in a child process and return its JSON result"""
+    command = [sys.executable, '-m', 'hackscraper.bench', '--child', str(size), '--modes', mode]
+    if args.mongo:
+        command += ['--mongo', args.mongo]
+    if args.batch_size:
+        command += ['--batch-size', str(args.batch_size)]
+    child = subprocess.run(
+        command, capture_output=True, text=True, cwd=SCRAPER_DIR
+    )
+    if args.verbose:
+        sys.stderr.write(child.stderr)
+    if child.returncode != 0:
+        return {'cards': size, 'mode': mode, 'error': child.stderr.strip().splitlines()[-1:]}
+    return json.loads(child.stdout)
+
+def python_wall_ms(arguments, repeats=STARTUP_REPEATS, env=None):
+    """Fastest wall time of running the interpreter with arguments, and its last output"""
+    best, output = None, ''
+    for _ in range(repeats):
+        started = time.perf_counter()
+        child = subprocess.run([sys.executable, *arguments], capture_output=True, text=True,
+                               cwd=SCRAPER_DIR, env=env)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+        output = child.stdout
+    return best, output
+
+def measure_startup(repeats=STARTUP_REPEATS):
+    """Import times of STARTUP_MODULES and startup of STARTUP_COMMANDS, in ms"""
+    interpreter, _ = python_wall_ms(['-c', 'pass'], repeats)
+    imports = {}
+    for module in STARTUP_MODULES:
+        timings = [python_wall_ms(['-c', IMPORT_TIMER.format(module=module)], 1)[1] for _ in range(repeats)]
+        timings = [float(t) for t in timings if t.strip()]
+        imports[module] = round(min(timings), 1) if timings else None
+    commands = {}
+    # A zero timeout fails server selection at once instead of retrying
+    env = {**os.environ, 'MONGODB_URI': STARTUP_MONGODB_URI, 'SCRAPER_MONGO_TIMEOUT_MS': '0'}
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, 'hackathons.jsonl'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'title': "Startup Hackathon", 'links': {}}) + '\n')
+        for command, arguments in STARTUP_COMMANDS.items():
+            arguments = [argument.format(directory=directory) for argument in arguments]
+            elapsed, _ = python_wall_ms(['-m', 'hackscraper', *arguments], repeats, env)
+            commands[command] = round(elapsed - interpreter, 1)
+    return {
+        'interpreter_ms': round(interpreter, 1),
+        'import_ms': imports,
+        'command_ms': commands,
+        'budget_ms': STARTUP_BUDGET_MS,
+        'over_budget': [command for command, ms in commands.items() if ms >= STARTUP_BUDGET_MS]
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='hackscraper bench', description="Offline scraper benchmark")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="'' to skip the flows")
+    parser.add_argument('--modes', default=','.join(DEFAULT_MODES))
+    parser.add_argument('--mongo', help="MongoDB URI of a local mongod to write to")
+    parser.add_argument('--batch-size', type=int)
+    parser.add_argument('--output', help="also write the JSON results to this file")
+    parser.add_argument('--verbose', action='store_true', help="show the scraper's own output")
+    parser.add_argument('--parse-workers', help="also time parsing alone at these worker counts, e.g. 1,2,4")
+    parser.add_argument('--parse-size', type=int, default=DEFAULT_PARSE_SIZE)
+    parser.add_argument('--parse-chunk', type=int, help="records per worker task")
+    parser.add_argument('--no-startup', dest='startup', action='store_false', help="skip the startup timings")
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_flow(args.child, args.modes, args.mongo, args.batch_size)))
+        return 0
+
+    runs = [
+        run_isolated(int(size), mode, args)
+        for size in filter(None, args.sizes.split(','))
+        for mode in args.modes.split(',')
+    ]
+    results = {
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'runs': runs
+    }
+    if args.startup:
+        results['startup'] = measure_startup()
+    if args.parse_workers:
+        results['parse_scaling'] = run_parse_scaling(
+            args.parse_size, [int(n) for n in args.parse_workers.split(',')], args.parse_chunk
+        )
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
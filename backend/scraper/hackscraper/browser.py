@@ -0,0 +1,1079 @@
+"""
+Listing page fetching with Playwright: browser, capture and API fetch modes,
+readiness detection, selector discovery and persistent browser profiles.
+Playwright itself is imported when a browser is first started.
+"""
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .metrics import ScrapeMetrics
+from .parsing import API_MAX_PAGES, API_PER_PAGE, UNSTOP_API_PATH, UNSTOP_API_URL, parse_api_payload
+
+# Target URL for hackathons
+TARGET_URL = 'https://unstop.com/hackathons?oppstatus=open&domain=2&course=6&specialization=Information%20Technology&usertype=students&passingOutYear=2027'
+
+# Elements probed (in order) for a card's title
+CARD_TITLE_SELECTORS = [
+    'h3', 'h4', '.title', '.card-title',
+    '[class*="title"]', '[class*="heading"]',
+    'strong', 'b'
+]
+
+# Runs inside the page over all matched cards and returns one plain record per
+# card, so extraction costs a single IPC round-trip instead of 10-20 per card
+EXTRACT_CARDS_JS = """
+(cards, titleSelectors) => cards.map(card => {
+    const titles = titleSelectors.map(sel => {
+        const el = card.querySelector(sel);
+        return el ? (el.textContent || '').trim() : null;
+    });
+    const anchor = card.tagName.toLowerCase() === 'a' ? card : card.querySelector('a');
+    return {
+        text: (card.textContent || '').trim(),
+        titles: titles,
+        href: anchor ? anchor.getAttribute('href') : null
+    };
+})
+"""
+
+# Candidate selectors for hackathon cards, tried in order
+CARD_SELECTORS = [
+    # Unstop specific (confirmed working)
+    '.trending_card',
+    'div.trending_card',
+    '[class*="trending_card"]',
+    # Try these common Unstop selectors
+    '[data-testid="competition-card"]',
+    '.competition-tile',
+    '.styles_competitionCard__aBcDe',
+    '.styles_interactableCard__xYzAb',
+    'a[href^="/competition/"]',
+    'a[href*="competition"]',
+    'a[href*="hackathon"]',
+    'div[class*="card"]',
+    'div[class*="competition"]',
+    'div[class*="hackathon"]',
+    '.search-result-item',
+    '.listing-card',
+]
+
+# How page readiness is detected: 'networkidle', 'stable' or 'mutation'
+READINESS_MODE = os.getenv('SCRAPER_READINESS', 'stable')
+READY_QUIET_MS = 750
+READY_TIMEOUT_MS = 15000
+SCROLL_IDLE_MS = 1500
+SCROLL_MAX_ROUNDS = 50
+
+# Resolves once the number of candidate cards has stopped changing. While
+# selector matches nothing but fallback does (a cached selector gone stale),
+# it switches to counting fallback instead of waiting out the timeout
+WAIT_FOR_STABLE_COUNT_JS = """
+async ({selector, fallback, quietMs, timeoutMs}) => {
+    const started = performance.now();
+    let last = -1;
+    let lastChange = started;
+    while (performance.now() - started < timeoutMs) {
+        let count = document.querySelectorAll(selector).length;
+        if (count === 0 && fallback && document.querySelectorAll(fallback).length > 0) {
+            selector = fallback;
+            fallback = null;
+            count = document.querySelectorAll(selector).length;
+        }
+        if (count !== last) {
+            last = count;
+            lastChange = performance.now();
+        } else if (count > 0 && performance.now() - lastChange >= quietMs) {
+            return {count: count, settled: true};
+        }
+        await new Promise(r => setTimeout(r, 100));
+    }
+    return {count: last, settled: false};
+}
+"""
+
+# Resolves once the DOM has gone quietMs without a mutation
+WAIT_FOR_DOM_QUIET_JS = """
+({quietMs, timeoutMs}) => new Promise(resolve => {
+    let quietTimer = null;
+    let limitTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    const finish = settled => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(limitTimer);
+        resolve({settled: settled});
+    };
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    quietTimer = setTimeout(() => finish(true), quietMs);
+    limitTimer = setTimeout(() => finish(false), timeoutMs);
+})
+"""
+
+# Scrolls to the bottom until no new cards appear within idleMs
+SCROLL_UNTIL_EXHAUSTED_JS = """
+async ({selector, idleMs, maxRounds}) => {
+    const count = () => document.querySelectorAll(selector).length;
+    let current = count();
+    let rounds = 0;
+    while (rounds < maxRounds) {
+        const before = current;
+        window.scrollTo(0, document.documentElement.scrollHeight);
+        const deadline = performance.now() + idleMs;
+        while ((current = count()) === before && performance.now() < deadline) {
+            await new Promise(r => setTimeout(r, 100));
+        }
+        if (current === before) {
+            break;
+        }
+        rounds++;
+    }
+    return {rounds: rounds, count: current};
+}
+"""
+
+# Counts every candidate card selector in one pass, with a structural
+# signature of each one's first match: its ancestor path of tags and class
+# names, minus the hash suffixes CSS modules append
+PROBE_CARD_SELECTORS_JS = """
+(selectors) => {
+    const stripHash = name => name.replace(/__[A-Za-z0-9_-]{4,}$/, '');
+    const signature = el => {
+        const path = [];
+        for (let node = el; node && node !== document.body && path.length < 6; node = node.parentElement) {
+            const classes = Array.from(node.classList).map(stripHash).sort().join('.');
+            path.push(node.tagName.toLowerCase() + (classes ? '.' + classes : ''));
+        }
+        return path.join('<');
+    };
+    return selectors.map(selector => {
+        let found;
+        try {
+            found = document.querySelectorAll(selector);
+        } catch (e) {
+            return {count: 0, signature: null};
+        }
+        return {count: found.length, signature: found.length ? signature(found[0]) : null};
+    });
+}
+"""
+
+# Heuristic card detection for pages no selector matches: scores every
+# container in one pass, grouping siblings of the same tag and classes, and
+# returns the best-scoring repeated group as EXTRACT_CARDS_JS records
+SCAN_CARD_CONTAINERS_JS = """
+({keywords, titleSelectors, minText, maxText, minGroup}) => {
+    const extract = EXTRACT_CARDS_JS;
+    const stripHash = name => name.replace(/__[A-Za-z0-9_-]{4,}$/, '');
+    const shape = el => [el.tagName.toLowerCase(), ...Array.from(el.classList).map(stripHash).sort()].join('.');
+    const groups = new Map();
+    const containers = document.querySelectorAll('div, article, section, li, a');
+    for (const el of containers) {
+        const parent = el.parentElement;
+        const text = (el.textContent || '').trim();
+        if (!parent || text.length < minText || text.length > maxText) {
+            continue;
+        }
+        const lower = text.toLowerCase();
+        const hits = keywords.filter(word => lower.includes(word)).length;
+        const linked = el.tagName === 'A' || el.querySelector('a[href]') !== null;
+        const key = shape(el);
+        let siblings = groups.get(parent);
+        if (!siblings) {
+            siblings = new Map();
+            groups.set(parent, siblings);
+        }
+        let group = siblings.get(key);
+        if (!group) {
+            group = {key: key, members: [], matching: 0, score: 0};
+            siblings.set(key, group);
+        }
+        group.members.push(el);
+        group.matching += hits ? 1 : 0;
+        group.score += hits + (linked ? 1 : 0);
+    }
+    let best = null;
+    for (const siblings of groups.values()) {
+        for (const group of siblings.values()) {
+            if (group.matching >= minGroup && (!best || group.score > best.score)) {
+                best = group;
+            }
+        }
+    }
+    return {
+        scanned: containers.length,
+        group: best ? {key: best.key, size: best.members.length, score: best.score} : null,
+        records: best ? extract(best.members, titleSelectors) : []
+    };
+}
+""".replace('EXTRACT_CARDS_JS', EXTRACT_CARDS_JS.strip())
+CONTAINER_KEYWORDS = ['hackathon', 'competition', 'prize', 'deadline', 'register', 'days left', 'team']
+CONTAINER_TEXT_RANGE = (50, 800)
+
+# Where the last winning card selector per listing page is remembered ('off'
+# disables it), and the fraction of its remembered card count below which it
+# is considered broken
+SELECTOR_CACHE_FILE = os.getenv('SCRAPER_SELECTOR_CACHE', 'data/selector_cache.json')
+SELECTOR_COLLAPSE_RATIO = 0.5
+
+# Listing pages scraped per run, how many are fetched at once, and the minimum
+# gap in seconds between two requests to the same host
+SCRAPER_PAGES = int(os.getenv('SCRAPER_PAGES', '1'))
+SCRAPER_CONCURRENCY = int(os.getenv('SCRAPER_CONCURRENCY', '3'))
+SCRAPER_HOST_INTERVAL = float(os.getenv('SCRAPER_HOST_INTERVAL', '1.0'))
+
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-gpu',
+    '--ignore-certificate-errors'
+]
+
+CONTEXT_OPTIONS = {
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'locale': 'en-US',
+    'timezone_id': 'Asia/Kolkata',
+    'ignore_https_errors': True
+}
+
+# Third-party hosts that never carry listing data
+TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'googlesyndication.com', 'facebook.net', 'facebook.com', 'hotjar.com',
+    'clarity.ms', 'mixpanel.com', 'segment.io', 'moengage.com',
+    'webengage.com', 'linkedin.com', 'licdn.com'
+)
+
+# 'full' loads the page like a desktop browser; 'lean' skips everything the
+# card text does not depend on
+SCRAPE_PROFILES = {
+    'full': {
+        'viewport': {'width': 1920, 'height': 1080},
+        'blocked_resource_types': (),
+        'block_trackers': False,
+        'screenshot': True
+    },
+    'lean': {
+        'viewport': {'width': 1024, 'height': 768},
+        'blocked_resource_types': ('image', 'media', 'font'),
+        'block_trackers': True,
+        'screenshot': False
+    }
+}
+SCRAPER_PROFILE = os.getenv('SCRAPER_PROFILE', 'lean')
+
+# URL patterns standing in for resource types that have no launch flag, for
+# contexts that cannot route requests (see apply_profile)
+RESOURCE_TYPE_EXTENSIONS = {
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'ogg', 'ogv', 'mp3', 'm4a', 'wav', 'mov', 'm3u8')
+}
+
+def blocked_url_patterns(resource_types):
+    """Network.setBlockedURLs patterns for the resource types given"""
+    return [pattern for resource_type in resource_types
+            for extension in RESOURCE_TYPE_EXTENSIONS.get(resource_type, ())
+            for pattern in (f"*.{extension}", f"*.{extension}?*")]
+
+# 'browser' reads the rendered DOM, 'capture' records the page's own listing
+# API responses, 'api' calls that API directly without launching Chromium
+FETCH_MODES = ('browser', 'capture', 'api')
+FETCH_MODE = os.getenv('SCRAPER_FETCH_MODE', 'browser')
+
+# Navigation timing of the current document, in milliseconds
+PAGE_LOAD_TIMING_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    return nav ? {domContentLoaded: nav.domContentLoadedEventEnd, load: nav.loadEventEnd} : null;
+}
+"""
+
+def strip_page_param(url):
+    """Drop the pagination parameter from a listing URL"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'page']
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def build_listing_urls(base_url=TARGET_URL, pages=1):
+    """Expand a listing URL into one URL per pagination page"""
+    parts = urlsplit(base_url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'page']
+    urls = [base_url]
+    for page_number in range(2, pages + 1):
+        page_query = urlencode(query + [('page', str(page_number))])
+        urls.append(urlunsplit(parts._replace(query=page_query)))
+    return urls
+
+class HostRateLimiter:
+    """Spaces out requests to the same host by a minimum interval"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url):
+        host = urlsplit(url).netloc
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+def is_tracker_host(host):
+    """Whether a request host belongs to a known analytics or ad network"""
+    return any(host == tracker or host.endswith('.' + tracker) for tracker in TRACKER_HOSTS)
+
+async def apply_profile(context, profile, network, route_requests=True):
+    """
+    Install request blocking and transfer accounting for a scrape profile.
+    
+    Routing turns Chromium's HTTP cache off, so persistent profiles pass
+    route_requests=False: images and trackers are then blocked by launch
+    flags, and fonts and media by URL through each page's DevTools session,
+    which leaves the cache on. Returns the (event, listener) pairs added so
+    a long-lived context can remove them again.
+    """
+    blocked_types = set(profile['blocked_resource_types'])
+    listeners = []
+    
+    if route_requests and (blocked_types or profile['block_trackers']):
+        async def handle_route(route):
+            request = route.request
+            if request.resource_type in blocked_types or (
+                profile['block_trackers'] and is_tracker_host(urlsplit(request.url).hostname or '')
+            ):
+                network['blocked'] += 1
+                await route.abort()
+            else:
+                await route.continue_()
+        
+        await context.route('**/*', handle_route)
+    
+    patterns = blocked_url_patterns(blocked_types) if not route_requests else []
+    if patterns:
+        async def block_urls(page):
+            try:
+                cdp = await context.new_cdp_session(page)
+                await cdp.send('Network.enable')
+                await cdp.send('Network.setBlockedURLs', {'urls': patterns})
+            except Exception as e:
+                print(f"[WARN] Could not block fonts and media: {str(e)[:80]}")
+        
+        def handle_failed(request):
+            if 'ERR_BLOCKED_BY_CLIENT' in (request.failure or ''):
+                network['blocked'] += 1
+        
+        # Fonts and media are only requested once the document has parsed,
+        # after the page's blocklist is in place
+        for page in context.pages:
+            await block_urls(page)
+        context.on('page', block_urls)
+        context.on('requestfailed', handle_failed)
+        listeners += [('page', block_urls), ('requestfailed', handle_failed)]
+    
+    async def handle_finished(request):
+        network['requests'] += 1
+        try:
+            sizes = await request.sizes()
+            network['bytes'] += sizes['responseHeadersSize'] + sizes['responseBodySize']
+        except Exception:
+            pass
+    
+    context.on('requestfinished', handle_finished)
+    listeners.append(('requestfinished', handle_finished))
+    return listeners
+
+async def wait_for_listing_ready(page, mode, card_selectors=CARD_SELECTORS, fallback_selectors=None):
+    """
+    Block until the listing has rendered, using the given readiness mode.
+    
+    In 'stable' mode fallback_selectors are counted instead as soon as
+    card_selectors match nothing while they match something.
+    """
+    try:
+        if mode == 'networkidle':
+            await page.wait_for_load_state('networkidle', timeout=READY_TIMEOUT_MS)
+        elif mode == 'mutation':
+            result = await page.evaluate(WAIT_FOR_DOM_QUIET_JS, {
+                'quietMs': READY_QUIET_MS, 'timeoutMs': READY_TIMEOUT_MS
+            })
+            if not result['settled']:
+                print("[WARN] DOM still changing, continuing anyway")
+        elif mode == 'stable':
+            result = await page.evaluate(WAIT_FOR_STABLE_COUNT_JS, {
+                'selector': ', '.join(card_selectors),
+                'fallback': ', '.join(fallback_selectors) if fallback_selectors else None,
+                'quietMs': READY_QUIET_MS,
+                'timeoutMs': READY_TIMEOUT_MS
+            })
+            if not result['settled']:
+                print("[WARN] Card count did not settle, continuing anyway")
+        else:
+            raise ValueError(f"Unknown readiness mode: {mode}")
+    except ValueError:
+        raise
+    except Exception as e:
+        print(f"[WARN] Readiness wait failed: {str(e)[:80]}")
+
+class SelectorCache:
+    """
+    The card selector that last worked for each listing, kept in a JSON file.
+    
+    Entries are keyed by the listing's host and path and hold the winning
+    selector, the number of cards it matched and the structural signature of
+    the first card.
+    """
+
+    def __init__(self, path=SELECTOR_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                print(f"[WARN] Ignoring unreadable selector cache {path}")
+
+    @staticmethod
+    def key(url):
+        parts = urlsplit(url)
+        return parts.netloc + parts.path
+
+    def get(self, url):
+        return self.entries.get(self.key(url))
+
+    def still_valid(self, entry, count, signature):
+        """Whether a cached selector still finds the same kind and number of cards"""
+        return (count > 1 and count >= entry['count'] * SELECTOR_COLLAPSE_RATIO
+                and signature == entry.get('signature'))
+
+    def remember(self, url, selector, count, signature):
+        entry = {'selector': selector, 'count': count, 'signature': signature}
+        if self.entries.get(self.key(url)) != entry:
+            self.entries[self.key(url)] = entry
+            self.save()
+
+    def forget(self, url):
+        if self.entries.pop(self.key(url), None):
+            self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+
+_selector_caches = {}
+
+def open_selector_cache(path=None):
+    """The process-wide selector cache for path, or None when it is turned off"""
+    path = path or SELECTOR_CACHE_FILE
+    if path == 'off':
+        return None
+    # Shared so concurrent sources do not overwrite each other's entries
+    if path not in _selector_caches:
+        _selector_caches[path] = SelectorCache(path)
+    return _selector_caches[path]
+
+async def discover_card_selector(page, url, card_selectors, selector_cache=None):
+    """
+    Pick the card selector for a rendered listing page in one evaluate.
+    
+    Every candidate is counted in a single querySelectorAll pass. The cached
+    winner for this listing is kept while its card count holds up and the
+    page structure matches; otherwise its entry is dropped and the first
+    candidate matching more than one card wins and is remembered. Returns
+    (selector, count), or (None, 0) when nothing matched.
+    """
+    cached = selector_cache.get(url) if selector_cache else None
+    candidates = list(card_selectors)
+    if cached:
+        candidates = [cached['selector']] + [c for c in candidates if c != cached['selector']]
+    try:
+        probes = dict(zip(candidates, await page.evaluate(PROBE_CARD_SELECTORS_JS, candidates)))
+    except Exception as e:
+        print(f"[WARN] Selector probe failed: {str(e)[:80]}")
+        return None, 0
+    
+    if cached:
+        probe = probes[cached['selector']]
+        if selector_cache.still_valid(cached, probe['count'], probe['signature']):
+            print(f"Found {probe['count']} cards with cached selector: '{cached['selector']}'")
+            selector_cache.remember(url, cached['selector'], probe['count'], probe['signature'])
+            return cached['selector'], probe['count']
+        print(f"[INFO] Cached selector '{cached['selector']}' now matches {probe['count']} cards "
+              f"(was {cached['count']}), probing all candidates")
+        selector_cache.forget(url)
+    
+    for selector in card_selectors:
+        probe = probes[selector]
+        if probe['count'] > 1:  # We want multiple cards, not just one
+            print(f"Found {probe['count']} cards with selector: '{selector}'")
+            if selector_cache:
+                selector_cache.remember(url, selector, probe['count'], probe['signature'])
+            return selector, probe['count']
+    return None, 0
+
+async def scan_card_containers(page, title_selectors=CARD_TITLE_SELECTORS):
+    """Find cards by scoring the page's containers in-page; returns raw card records"""
+    try:
+        result = await page.evaluate(SCAN_CARD_CONTAINERS_JS, {
+            'keywords': CONTAINER_KEYWORDS,
+            'titleSelectors': title_selectors,
+            'minText': CONTAINER_TEXT_RANGE[0],
+            'maxText': CONTAINER_TEXT_RANGE[1],
+            'minGroup': 2
+        })
+    except Exception as e:
+        print(f"[WARN] Container scan failed: {str(e)[:80]}")
+        return []
+    group = result['group']
+    print(f"   Scored {result['scanned']} containers")
+    if group:
+        print(f"   Found {group['size']} potential hackathon cards ('{group['key']}', score {group['score']})")
+    return result['records']
+
+async def scroll_until_no_new_cards(page, selector):
+    """Trigger infinite-scroll loading until the card count stops growing"""
+    try:
+        return await page.evaluate(SCROLL_UNTIL_EXHAUSTED_JS, {
+            'selector': selector,
+            'idleMs': SCROLL_IDLE_MS,
+            'maxRounds': SCROLL_MAX_ROUNDS
+        })
+    except Exception as e:
+        print(f"[WARN] Scrolling failed: {str(e)[:80]}")
+        return {'rounds': 0, 'count': await page.locator(selector).count()}
+
+def build_api_params(listing_url, page_number):
+    """Translate a listing page URL's filters into listing API query params"""
+    params = {k: v for k, v in parse_qsl(urlsplit(listing_url).query) if k != 'page'}
+    params.update({
+        'opportunity': 'hackathons',
+        'page': page_number,
+        'per_page': API_PER_PAGE
+    })
+    return params
+
+async def fetch_api_listing(request_context, listing_url, rate_limiter, emit):
+    """Page through the listing API for one listing URL, emitting each page's records"""
+    emitted = 0
+    page_number = 1
+    last_page = 1
+    while page_number <= min(last_page, API_MAX_PAGES):
+        await rate_limiter.wait(UNSTOP_API_URL)
+        response = await request_context.get(UNSTOP_API_URL, params=build_api_params(listing_url, page_number))
+        if not response.ok:
+            raise RuntimeError(f"API returned HTTP {response.status}")
+        items, last_page = parse_api_payload(await response.json())
+        await emit([{'api_item': item, 'page_url': listing_url} for item in items])
+        emitted += len(items)
+        page_number += 1
+    return emitted
+
+async def fetch_api_records(p, urls, rate_limiter, metrics, emit):
+    """Fetch every listing through the JSON API over one pooled HTTP client"""
+    # Pagination is followed through the API, so only distinct filter sets
+    # matter; they share one host and rate limit, so they run in turn
+    listings = list(dict.fromkeys(strip_page_param(url) for url in urls))
+    phase_start = time.perf_counter()
+    request_context = await p.request.new_context(extra_http_headers={
+        'User-Agent': CONTEXT_OPTIONS['user_agent'],
+        'Accept': 'application/json'
+    })
+    
+    emitted = 0
+    try:
+        for listing_url in listings:
+            try:
+                emitted += await fetch_api_listing(request_context, listing_url, rate_limiter, emit)
+            except Exception as e:
+                print(f"[WARN] API fetch failed for {listing_url[:80]}: {str(e)[:80]}")
+                metrics.error('api_fetch', e)
+    finally:
+        await request_context.dispose()
+    metrics.record_phase('api_fetch', phase_start)
+    return emitted
+
+def is_listing_api_response(response):
+    """Whether a captured browser response is a listing API JSON payload"""
+    return (urlsplit(response.url).path == UNSTOP_API_PATH
+            and 'json' in (response.headers.get('content-type') or ''))
+
+async def scrape_listing_page(context, url, readiness, metrics, network, screenshot_path=None,
+                              capture_api=False, card_selectors=CARD_SELECTORS,
+                              title_selectors=CARD_TITLE_SELECTORS, selector_cache=None):
+    """
+    Load one listing URL in the given context and return its raw card records.
+    
+    With capture_api the listing API responses the page makes are recorded and
+    returned instead of DOM records whenever any were seen. Cards are located
+    with card_selectors and titled with title_selectors; a selector_cache
+    entry for the URL is waited on and tried first.
+    """
+    page = await context.new_page()
+    cached = selector_cache.get(url) if selector_cache else None
+    ready_selectors = [cached['selector']] if cached else card_selectors
+    fallback_selectors = card_selectors if cached else None
+    captured = []
+    
+    async def handle_response(response):
+        if is_listing_api_response(response):
+            try:
+                items, _ = parse_api_payload(await response.json())
+                captured.extend(items)
+            except Exception:
+                pass
+    
+    if capture_api:
+        page.on('response', handle_response)
+    try:
+        # Navigate with retries
+        print(f"[INFO] Navigating to {url[:80]}...")
+        max_nav_retries = 3
+        nav_success = False
+        
+        for attempt in range(max_nav_retries):
+            try:
+                print(f"[INFO] Connection attempt {attempt + 1}/{max_nav_retries}...")
+                phase_start = time.perf_counter()
+                await page.goto(url, wait_until="domcontentloaded", timeout=120000)
+                metrics.record_phase('navigation', phase_start)
+                print("[OK] Page loaded, waiting for content to render...")
+                nav_success = True
+                phase_start = time.perf_counter()
+                await wait_for_listing_ready(page, readiness, ready_selectors, fallback_selectors)
+                metrics.record_phase('readiness', phase_start)
+                load_timing = await page.evaluate(PAGE_LOAD_TIMING_JS)
+                if load_timing:
+                    network['load_ms'].append(load_timing['load'] or load_timing['domContentLoaded'])
+                break
+            except Exception as nav_error:
+                print(f"[WARN] Attempt {attempt + 1} failed: {str(nav_error)[:80]}")
+                if attempt < max_nav_retries - 1:
+                    metrics.retry('navigation')
+                    print("[INFO] Retrying in 5 seconds...")
+                    await asyncio.sleep(5)
+                else:
+                    print("[ERROR] All navigation attempts failed")
+        
+        if not nav_success:
+            print(f"[ERROR] Could not load {url[:80]}. Check your internet connection.")
+            return []
+        
+        # Take screenshot for debugging
+        if screenshot_path:
+            os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
+            try:
+                await page.screenshot(path=screenshot_path)
+                print(f"[OK] Screenshot saved to {screenshot_path}")
+            except Exception:
+                print("[WARN] Could not save screenshot")
+        
+        cards = None
+        selected_selector = None
+        
+        # Try to find cards with multiple attempts
+        max_retries = 3
+        for retry in range(max_retries):
+            if cards:
+                break
+                
+            if retry > 0:
+                print(f"   Retry {retry}/{max_retries}...")
+                metrics.retry('selector_discovery')
+                phase_start = time.perf_counter()
+                await page.reload(wait_until="domcontentloaded", timeout=60000)
+                await wait_for_listing_ready(page, readiness, card_selectors)
+                metrics.record_phase('reload', phase_start)
+            
+            phase_start = time.perf_counter()
+            selected_selector, _ = await discover_card_selector(page, url, card_selectors, selector_cache)
+            if selected_selector:
+                cards = page.locator(selected_selector)
+            metrics.record_phase('selector_discovery', phase_start)
+        
+        if cards:
+            print(f"Using selector: {selected_selector}")
+            # Load the whole infinite-scroll listing before extracting
+            phase_start = time.perf_counter()
+            scroll_result = await scroll_until_no_new_cards(page, selected_selector)
+            metrics.record_phase('scroll', phase_start)
+            print(f"[INFO] Scrolled {scroll_result['rounds']} times, {scroll_result['count']} cards loaded")
+        
+        if captured:
+            print(f"[OK] Captured {len(captured)} listings from the page's API responses")
+            return [{'api_item': item, 'page_url': page.url} for item in captured]
+        
+        if cards:
+            # Pull every card's text, title candidates and link in one round-trip
+            phase_start = time.perf_counter()
+            records = await cards.evaluate_all(EXTRACT_CARDS_JS, title_selectors)
+            metrics.record_phase('extraction', phase_start)
+        else:
+            # No selector matched more than one card: score containers instead
+            print("Trying fallback: scoring all potential containers...")
+            phase_start = time.perf_counter()
+            records = await scan_card_containers(page, title_selectors)
+            metrics.record_phase('container_scan', phase_start)
+        for record in records:
+            record['page_url'] = page.url
+        return records
+    finally:
+        await page.close()
+
+class OrderedEmitter:
+    """Hands per-page record lists on in page order as pages finish out of order"""
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.ready = {}
+        self.next_index = 0
+        self.lock = asyncio.Lock()
+
+    async def put(self, index, records):
+        self.ready[index] = records
+        async with self.lock:
+            while self.next_index in self.ready:
+                records = self.ready.pop(self.next_index)
+                self.next_index += 1
+                await self.emit(records)
+
+async def launch_browser(p):
+    """Launch headless Chromium with the scraper's stealth settings"""
+    print("[INFO] Launching browser...")
+    return await p.chromium.launch(headless=True, args=BROWSER_ARGS)
+
+# On-disk Chromium profile reused across runs so the site's scripts, styles,
+# TLS sessions and cookies are cached ('' launches a fresh browser each run),
+# and the size past which its caches are evicted
+BROWSER_PROFILE_DIR = os.getenv('SCRAPER_BROWSER_PROFILE', '')
+BROWSER_PROFILE_MAX_MB = int(os.getenv('SCRAPER_BROWSER_PROFILE_MAX_MB', '300'))
+# Profile subdirectories that only hold caches and are safe to drop
+PROFILE_CACHE_DIRS = {'Cache', 'Code Cache', 'GPUCache', 'GrShaderCache', 'ShaderCache', 'Service Worker'}
+PROFILE_TIMINGS_FILE = 'scraper-timings.json'
+
+def directory_size(path):
+    """Total size in bytes of the files under path"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def prepare_browser_profile(path, max_mb=None):
+    """
+    Make sure the profile directory exists and fits its size budget.
+    
+    Over budget, the cache subdirectories are dropped first and the whole
+    profile only if that is not enough. Returns (state, size_mb, evicted),
+    where state is 'warm' when a cache survived from an earlier run.
+    """
+    limit = (BROWSER_PROFILE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+    warm = os.path.isdir(path) and any(
+        name in PROFILE_CACHE_DIRS for _, dirs, _ in os.walk(path) for name in dirs
+    )
+    evicted = False
+    if warm and directory_size(path) > limit:
+        for root, dirs, _ in os.walk(path):
+            for name in [d for d in dirs if d in PROFILE_CACHE_DIRS]:
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+                dirs.remove(name)
+        if directory_size(path) > limit:
+            shutil.rmtree(path, ignore_errors=True)
+        warm = False
+        evicted = True
+    os.makedirs(path, exist_ok=True)
+    return ('warm' if warm else 'cold'), round(directory_size(path) / (1024 * 1024), 1), evicted
+
+def persistent_launch_options(profile):
+    """launch_persistent_context options applying a scrape profile without routing"""
+    args = BROWSER_ARGS + [f"--disk-cache-size={BROWSER_PROFILE_MAX_MB * 1024 * 1024 // 2}"]
+    if 'image' in profile['blocked_resource_types']:
+        args.append('--blink-settings=imagesEnabled=false')
+    if profile['block_trackers']:
+        args.append('--host-resolver-rules=' + ', '.join(
+            f"MAP {host} ~NOTFOUND, MAP *.{host} ~NOTFOUND" for host in TRACKER_HOSTS
+        ))
+    return dict(headless=True, args=args, viewport=profile['viewport'], **CONTEXT_OPTIONS)
+
+async def launch_persistent_context(p, path, profile):
+    """Launch Chromium on the on-disk profile at path and return its only context"""
+    print(f"[INFO] Launching browser with persistent profile {path}...")
+    context = await p.chromium.launch_persistent_context(path, **persistent_launch_options(profile))
+    # Set longer default timeout
+    context.set_default_timeout(120000)
+    return context
+
+def record_profile_timing(path, state, started, network, metrics):
+    """
+    Store the browser time since started as the profile's latest cold or warm
+    run and add the cold-versus-warm comparison to metrics.
+    """
+    seconds = time.perf_counter() - started
+    timings_path = os.path.join(path, PROFILE_TIMINGS_FILE)
+    timings = {}
+    try:
+        with open(timings_path, encoding='utf-8') as f:
+            timings = json.load(f)
+    except (OSError, ValueError):
+        pass
+    timings[state] = {
+        'seconds': round(seconds, 3),
+        'bytes': network['bytes'],
+        'requests': network['requests'],
+        'at': datetime.now().isoformat()
+    }
+    try:
+        with open(timings_path, 'w', encoding='utf-8') as f:
+            json.dump(timings, f)
+    except OSError:
+        pass
+    
+    info = {
+        'state': state,
+        'size_mb': round(directory_size(path) / (1024 * 1024), 1),
+        'last_cold': timings.get('cold'),
+        'last_warm': timings.get('warm')
+    }
+    if 'cold' in timings and 'warm' in timings and timings['warm']['seconds']:
+        info['warm_speedup'] = round(timings['cold']['seconds'] / timings['warm']['seconds'], 2)
+    metrics.set_info('browser_profile', info)
+    metrics.record_phase(f"browser_fetch_{state}", started)
+
+class BrowserSession:
+    """
+    A Playwright driver and Chromium kept warm across scrape runs.
+    
+    Everything runs on one event loop owned by a background thread, so the
+    synchronous daemon loop can submit runs to it while the browser stays up
+    between them. The browser is launched on first use and relaunched if it
+    has crashed.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='browser-session', daemon=True)
+        self.thread.start()
+        self.playwright = None
+        self.browser = None
+        self.browser_lock = None
+        self.persistent = {}
+
+    def submit(self, coro):
+        """Schedule a coroutine on the session loop and return its future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def start(self):
+        from playwright.async_api import async_playwright
+        
+        async def start_driver():
+            self.playwright = await async_playwright().start()
+            self.browser_lock = asyncio.Lock()
+        self.submit(start_driver()).result()
+        return self
+
+    async def get_browser(self):
+        async with self.browser_lock:
+            if self.browser is None or not self.browser.is_connected():
+                self.browser = await launch_browser(self.playwright)
+            return self.browser
+
+    async def get_persistent_context(self, path, profile):
+        """
+        The session's context on the profile at path, launched on first use.
+        
+        Returns (context, state); state is 'warm' once the context has already
+        served a run in this session.
+        """
+        async with self.browser_lock:
+            entry = self.persistent.get(path)
+            if entry and not entry['closed']:
+                return entry['context'], 'warm'
+            state, _, _ = prepare_browser_profile(path)
+            context = await launch_persistent_context(self.playwright, path, profile)
+            entry = {'context': context, 'closed': False}
+            context.on('close', lambda _: entry.update(closed=True))
+            self.persistent[path] = entry
+            return context, state
+
+    def close(self):
+        async def stop_driver():
+            for entry in self.persistent.values():
+                if not entry['closed']:
+                    await entry['context'].close()
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+        try:
+            self.submit(stop_driver()).result(timeout=30)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5)
+
+async def scrape_with_browser(browser, urls, emitter, concurrency, rate_limiter, readiness,
+                              profile, take_screenshot, metrics, network, capture_api,
+                              card_selectors=CARD_SELECTORS, title_selectors=CARD_TITLE_SELECTORS,
+                              selector_cache=None, shared_context=None):
+    """
+    Render each listing URL in a pool of contexts, emitting records page by page.
+    
+    With shared_context (a persistent profile allows only one) every worker
+    opens its pages there instead of in a context of its own.
+    """
+    print(f"[INFO] Scraping with {concurrency} browser {'pages' if shared_context else 'contexts'}...")
+    url_queue = asyncio.Queue()
+    for index, url in enumerate(urls):
+        url_queue.put_nowait((index, url))
+    
+    async def worker():
+        context = shared_context
+        if context is None:
+            context = await browser.new_context(viewport=profile['viewport'], **CONTEXT_OPTIONS)
+            # Set longer default timeout
+            context.set_default_timeout(120000)
+            await apply_profile(context, profile, network)
+        try:
+            while True:
+                try:
+                    index, url = url_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                records = []
+                try:
+                    await rate_limiter.wait(url)
+                    screenshot_path = 'data/page_screenshot.png' if take_screenshot and index == 0 else None
+                    records = await scrape_listing_page(
+                        context, url, readiness, metrics, network, screenshot_path, capture_api,
+                        card_selectors, title_selectors, selector_cache
+                    )
+                except Exception as e:
+                    # One broken page must not take the other workers down
+                    print(f"[ERROR] Failed to scrape {url[:80]}: {str(e)[:80]}")
+                    metrics.error('page', e)
+                await emitter.put(index, records)
+        finally:
+            if context is not shared_context:
+                await context.close()
+    
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+async def produce_card_records(emit, urls=None, concurrency=None, host_interval=None, readiness=None,
+                               profile=None, screenshot=None, fetch_mode=None, session=None,
+                               card_selectors=None, title_selectors=None, metrics=None,
+                               browser_profile=None):
+    """
+    Scrape listing URLs and pass each page's raw card records to emit.
+    
+    Browser workers each own one context and pull URLs from a shared queue;
+    requests to the same host are spaced out by host_interval seconds, and
+    pages are emitted in URL order. profile names an entry of SCRAPE_PROFILES;
+    screenshot overrides whether the profile saves one. fetch_mode is one of
+    FETCH_MODES; 'api' falls back to the browser when the API yields nothing.
+    With a BrowserSession its driver and browser are reused instead of
+    launched for this run. card_selectors and title_selectors default to
+    Unstop's; the winning card selector is remembered in the selector cache.
+    Stage timings and network counters are added to metrics; a failure that
+    stops the whole fetch is raised once counted. browser_profile
+    is a directory for a persistent Chromium profile whose HTTP cache carries
+    over between runs (default BROWSER_PROFILE_DIR, '' for none).
+    """
+    urls = urls or build_listing_urls(TARGET_URL, SCRAPER_PAGES)
+    concurrency = max(1, min(concurrency or SCRAPER_CONCURRENCY, len(urls)))
+    rate_limiter = HostRateLimiter(SCRAPER_HOST_INTERVAL if host_interval is None else host_interval)
+    readiness = readiness or READINESS_MODE
+    profile_name = profile or SCRAPER_PROFILE
+    profile = SCRAPE_PROFILES[profile_name]
+    take_screenshot = profile['screenshot'] if screenshot is None else screenshot
+    metrics = metrics or ScrapeMetrics()
+    network = {'requests': 0, 'blocked': 0, 'bytes': 0, 'load_ms': []}
+    fetch_mode = fetch_mode or FETCH_MODE
+    if fetch_mode not in FETCH_MODES:
+        raise ValueError(f"Unknown fetch mode: {fetch_mode}")
+    browser_profile = BROWSER_PROFILE_DIR if browser_profile is None else browser_profile
+    
+    print(f"[INFO] Starting hackathon scraper ({fetch_mode} mode)...")
+    
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            if session:
+                p = session.playwright
+                get_browser = session.get_browser
+            else:
+                from playwright.async_api import async_playwright
+                p = await stack.enter_async_context(async_playwright())
+                
+                async def get_browser():
+                    browser = await launch_browser(p)
+                    stack.push_async_callback(browser.close)
+                    return browser
+            
+            if fetch_mode == 'api':
+                if not await fetch_api_records(p, urls, rate_limiter, metrics, emit):
+                    print("[WARN] API returned no listings, falling back to the browser")
+                    fetch_mode = 'browser'
+            
+            if fetch_mode != 'api':
+                print(f"[INFO] Using the '{profile_name}' page profile")
+                phase_start = time.perf_counter()
+                browser = shared_context = None
+                if browser_profile:
+                    if session:
+                        shared_context, state = await session.get_persistent_context(browser_profile, profile)
+                    else:
+                        state, _, evicted = prepare_browser_profile(browser_profile)
+                        if evicted:
+                            print(f"[INFO] Browser profile over {BROWSER_PROFILE_MAX_MB} MB, caches evicted")
+                        shared_context = await launch_persistent_context(p, browser_profile, profile)
+                        stack.push_async_callback(shared_context.close)
+                    listeners = await apply_profile(shared_context, profile, network, route_requests=False)
+                    for event, listener in listeners:
+                        stack.callback(shared_context.remove_listener, event, listener)
+                else:
+                    browser = await get_browser()
+                metrics.record_phase('browser_launch', phase_start)
+                
+                fetch_start = time.perf_counter()
+                await scrape_with_browser(
+                    browser, urls, OrderedEmitter(emit), concurrency, rate_limiter, readiness,
+                    profile, take_screenshot, metrics, network, fetch_mode == 'capture',
+                    card_selectors or CARD_SELECTORS, title_selectors or CARD_TITLE_SELECTORS,
+                    open_selector_cache(), shared_context
+                )
+                if browser_profile:
+                    record_profile_timing(browser_profile, state, fetch_start, network, metrics)
+    except Exception as e:
+        print(f" Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        # A failed launch or a dead driver fails the source (see run_source)
+        raise
+    finally:
+        metrics.count('http_requests', network['requests'])
+        metrics.count('http_blocked', network['blocked'])
+        metrics.count('http_bytes', network['bytes'])
+        if fetch_mode != 'api':
+            load_ms = network['load_ms']
+            avg_load = sum(load_ms) / len(load_ms) if load_ms else 0
+            print(f"[INFO] Profile '{profile_name}': {network['requests']} requests "
+                  f"({network['blocked']} blocked), {network['bytes'] / 1024:.0f} KiB transferred, "
+                  f"avg page load {avg_load:.0f} ms")
@@ -0,0 +1,143 @@
+"""
+Command line interface: python -m hackscraper <command> [options]
+
+Each command imports only the modules it needs when it runs, so save,
+export and recompute-status never load Playwright (and parse their
+arguments before pymongo or pyarrow are imported).
+"""
+import argparse
+import sys
+
+from .dataset_export import BACKUP_PATH, SNAPSHOT_FORMATS, SNAPSHOT_PATH
+
+def fix_console_encoding():
+    """Write UTF-8 (replacing what cannot be encoded) even on legacy Windows consoles"""
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, 'reconfigure'):
+            stream.reconfigure(encoding='utf-8', errors='replace')
+
+def run_scrape(args):
+    from .dedupe import open_fingerprint_index
+    from .sources import build_sources
+    from .storage import close_mongo_client
+    sources = build_sources(args.sources)
+
+    print("=" * 60)
+    print(" Unstop Hackathon Scraper - Enhanced Version")
+    print("=" * 60)
+
+    if args.daemon:
+        from .daemon import run_daemon
+        run_daemon(args.interval, args.jitter, args.health_port, health_host=args.health_host, sources=sources,
+                   enrich=args.enrich, parse_workers=args.parse_workers, batch_size=args.batch_size)
+        return 0
+
+    from .pipeline import run_pipeline
+    # Scrape, skipping cards already stored unchanged, and write as we go
+    saved_count = run_pipeline(args.batch_size, fingerprints=open_fingerprint_index(), sources=sources,
+                               enrich=args.enrich, parse_workers=args.parse_workers)
+    print(f" Process complete! {saved_count} hackathons saved.")
+    close_mongo_client()
+    return 0
+
+def read_documents(path):
+    """Documents from a JSON Lines file (gzipped or not) or a JSON array, last copy of each kept"""
+    from .dataset_export import iter_jsonl_gz, latest_documents
+    if path.endswith('.gz'):
+        return latest_documents(iter_jsonl_gz(path))
+    import json
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.json'):
+            return json.load(f)
+        return latest_documents(json.loads(line) for line in f if line.strip())
+
+def run_save(args):
+    from .storage import close_mongo_client, save_to_mongodb
+    try:
+        documents = read_documents(args.file)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not read {args.file}: {e}")
+        return 1
+    print(f"[INFO] Saving {len(documents)} hackathons from {args.file}")
+    saved = save_to_mongodb(documents, args.batch_size)
+    close_mongo_client()
+    return 0 if saved or not documents else 1
+
+def run_export(args):
+    from .storage import close_mongo_client, export_dataset
+    exported = export_dataset(args.path, args.format, args.backup)
+    close_mongo_client()
+    return 0 if exported else 1
+
+def run_recompute_status(args):
+    from .storage import close_mongo_client, recompute_statuses
+    try:
+        recompute_statuses(migrate_dates=args.migrate_dates)
+    except Exception as e:
+        print(f"[ERROR] Status recompute failed: {type(e).__name__}: {str(e)[:200]}")
+        return 1
+    finally:
+        close_mongo_client()
+    return 0
+
+def run_bench(args):
+    from .bench import main as bench_main
+    return bench_main(args.extra)
+
+def build_parser():
+    # Settings read from the environment are named rather than imported,
+    # so building the parser never loads the scraper modules
+    parser = argparse.ArgumentParser(prog='hackscraper', description="Scrape hackathons into MongoDB")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='command')
+
+    scrape = commands.add_parser('scrape', help="scrape every source and write to MongoDB")
+    scrape.add_argument('--sources', help="comma-separated sources to scrape (default SCRAPER_SOURCES)")
+    scrape.add_argument('--enrich', dest='enrich', action='store_true', default=None,
+                        help="fill in estimated fields from detail pages (default SCRAPER_ENRICH)")
+    scrape.add_argument('--no-enrich', dest='enrich', action='store_false', default=None,
+                        help="skip fetching detail pages for estimated fields")
+    scrape.add_argument('--parse-workers', type=int,
+                        help="processes parsing cards, 0 for one per core (default SCRAPER_PARSE_WORKERS)")
+    scrape.add_argument('--batch-size', type=int, help="documents per MongoDB write (default SCRAPER_BATCH_SIZE)")
+    scrape.add_argument('--daemon', action='store_true', help="keep running and rescrape on an interval")
+    scrape.add_argument('--interval', type=float, help="seconds between daemon runs")
+    scrape.add_argument('--jitter', type=float, help="random +/- fraction applied to the interval")
+    scrape.add_argument('--health-port', type=int, help="port for the daemon /health endpoint, 0 to disable")
+    scrape.add_argument('--health-host',
+                        help="address the /health endpoint binds (default SCRAPER_HEALTH_HOST, 127.0.0.1)")
+    scrape.set_defaults(handler=run_scrape)
+
+    save = commands.add_parser('save', help="save hackathons from a JSON Lines (.jsonl/.jsonl.gz) or JSON file")
+    save.add_argument('file')
+    save.add_argument('--batch-size', type=int, help="documents per MongoDB write (default SCRAPER_BATCH_SIZE)")
+    save.set_defaults(handler=run_save)
+
+    export = commands.add_parser('export', help="write a columnar snapshot of the stored hackathons")
+    export.add_argument('path', nargs='?', default=SNAPSHOT_PATH)
+    export.add_argument('--format', choices=SNAPSHOT_FORMATS,
+                        help="snapshot format, default arrow with pyarrow installed and soa without")
+    export.add_argument('--backup', default=BACKUP_PATH,
+                        help="history to export from when MongoDB is unavailable")
+    export.set_defaults(handler=run_export)
+
+    recompute = commands.add_parser('recompute-status', help="recompute every stored status from its dates")
+    recompute.add_argument('--migrate-dates', action='store_true',
+                           help="also convert string scraped_at values left by older versions (run once)")
+    recompute.set_defaults(handler=run_recompute_status)
+
+    # Every bench option, --help included, is passed on to hackscraper.bench
+    bench = commands.add_parser('bench', help="run the offline benchmark (see bench --help)", add_help=False)
+    bench.set_defaults(handler=run_bench)
+    return parser
+
+def main(argv=None):
+    fix_console_encoding()
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != 'bench':
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.extra = extra
+    sys.exit(args.handler(args) or 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Daemon mode: rescrape on an interval with a /health endpoint.
+"""
+import json
+import os
+import random
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .browser import BrowserSession
+from .dedupe import open_fingerprint_index
+from .metrics import ScrapeMetrics
+from .pipeline import run_pipeline
+from .storage import MongoJSONEncoder, close_mongo_client
+
+# Daemon mode: seconds between runs, +/- this fraction of random jitter, and
+# the address serving /health (port 0 disables it; loopback unless opened up)
+DAEMON_INTERVAL = float(os.getenv('SCRAPER_INTERVAL', '3600'))
+DAEMON_JITTER = float(os.getenv('SCRAPER_JITTER', '0.1'))
+HEALTH_HOST = os.getenv('SCRAPER_HEALTH_HOST', '127.0.0.1')
+HEALTH_PORT = int(os.getenv('SCRAPER_HEALTH_PORT', '8790'))
+# Runs after which the fingerprint index is read from the database again
+FINGERPRINT_RELOAD_RUNS = int(os.getenv('SCRAPER_FINGERPRINT_RELOAD_RUNS', '6'))
+
+def start_health_server(stats, port, host=None):
+    """Serve the daemon stats as JSON on /health from a background thread"""
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') not in ('', '/health'):
+                self.send_error(404)
+                return
+            with stats['lock']:
+                body = json.dumps({k: v for k, v in stats.items() if k != 'lock'}, cls=MongoJSONEncoder)
+                healthy = stats['last_run'] is None or stats['last_run']['ok']
+            self.send_response(200 if healthy else 503)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body.encode('utf-8'))
+        
+        def log_message(self, format, *args):
+            pass
+    
+    host = HEALTH_HOST if host is None else host
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    threading.Thread(target=server.serve_forever, name='health-server', daemon=True).start()
+    print(f"[INFO] Health endpoint on http://{host}:{port}/health")
+    return server
+
+def source_failures(results):
+    """Why a run's sources failed (an error, or no records at all), or None"""
+    failures = [
+        f"source '{result['source']}' {result['error'] or 'emitted no records'}"
+        for result in results if result['error'] or not result['records']
+    ]
+    return '; '.join(failures) or None
+
+def run_daemon(interval=None, jitter=None, health_port=None, stop=None, health_host=None, **pipeline_options):
+    """
+    Rescrape forever on an interval with jitter, keeping one warm browser.
+    
+    The pooled MongoClient and the BrowserSession live for the whole process,
+    so connection setup, browser launch and imports are paid once instead of
+    on every tick. Stops cleanly on Ctrl+C, SIGTERM or when stop (a
+    threading.Event) is set.
+    """
+    interval = DAEMON_INTERVAL if interval is None else interval
+    jitter = DAEMON_JITTER if jitter is None else jitter
+    health_port = HEALTH_PORT if health_port is None else health_port
+    stop = stop or threading.Event()
+    stats = {
+        'lock': threading.Lock(),
+        'started_at': datetime.utcnow(),
+        'runs': 0,
+        'failures': 0,
+        'last_run': None,
+        'next_run_at': None
+    }
+    
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    server = start_health_server(stats, health_port, health_host) if health_port else None
+    session = BrowserSession().start()
+    # Kept current by the pipeline's commits between reloads, rather than
+    # re-reading every stored contentHash on each tick; reloaded every
+    # FINGERPRINT_RELOAD_RUNS runs, or sooner once documents were deleted
+    fingerprints = None
+    runs_since_load = 0
+    
+    try:
+        while not stop.is_set():
+            started = datetime.utcnow()
+            run_start = time.perf_counter()
+            error = None
+            saved = 0
+            metrics = ScrapeMetrics()
+            try:
+                if fingerprints is None or runs_since_load >= FINGERPRINT_RELOAD_RUNS or fingerprints.stale():
+                    fingerprints = open_fingerprint_index()
+                    runs_since_load = 0
+                runs_since_load += 1
+                saved = run_pipeline(fingerprints=fingerprints, session=session, metrics=metrics,
+                                     **pipeline_options)
+                error = source_failures(metrics.sources)
+            except Exception as e:
+                error = f"{type(e).__name__}: {str(e)[:200]}"
+            if error:
+                print(f"[ERROR] Scrape run failed: {error}")
+            
+            delay = max(0.0, interval * (1 + random.uniform(-jitter, jitter)))
+            with stats['lock']:
+                stats['runs'] += 1
+                stats['failures'] += 1 if error else 0
+                stats['last_run'] = {
+                    'started_at': started,
+                    'duration_s': round(time.perf_counter() - run_start, 3),
+                    'saved': saved,
+                    'ok': error is None,
+                    'error': error,
+                    'sources': list(metrics.sources)
+                }
+                stats['next_run_at'] = datetime.utcnow() + timedelta(seconds=delay)
+            print(f"[INFO] Next run in {delay:.0f}s")
+            stop.wait(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("[INFO] Shutting down daemon...")
+        if server:
+            server.shutdown()
+        session.close()
+        close_mongo_client()
@@ -0,0 +1,411 @@
+"""
+Compact on-disk formats for the scraped hackathon dataset.
+
+Two outputs:
+- the scraper's append-only, gzip-compressed JSON Lines history of every
+  document written (each run appends one gzip member, so the file is never
+  rewritten); this module reads it back
+- a columnar snapshot of the current dataset: Arrow IPC (or Parquet) when
+  pyarrow is installed, otherwise a struct-of-arrays file this module writes
+  and reads itself
+
+SnapshotReader memory-maps either snapshot and filters on category, status
+and registration deadline by scanning only those columns, so only matching
+rows are ever turned back into Python objects.
+
+Usage: python dataset_export.py SNAPSHOT [--category C] [--status S]
+                                         [--deadline-after D] [--deadline-before D]
+"""
+import argparse
+import array
+import gzip
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from datetime import date
+
+# Set by load_pyarrow(); pyarrow is slow to import, so only snapshot
+# writes and Arrow/Parquet reads load it
+pyarrow = None
+_pyarrow_checked = False
+
+def load_pyarrow():
+    """Import pyarrow and the submodules used here, or return None when it is not installed"""
+    global pyarrow, _pyarrow_checked
+    if not _pyarrow_checked:
+        _pyarrow_checked = True
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError:
+            pyarrow = None
+    return pyarrow
+
+# Snapshot columns and how the struct-of-arrays format stores them: 'dict'
+# (repeated strings, uint16 codes or uint32 past 65536 distinct values, the
+# typecode recorded in the header), 'text' (offsets + UTF-8 blob),
+# 'days' (int32 days since 1970-01-01) or 'int' (int64)
+SNAPSHOT_COLUMNS = {
+    'title': 'text',
+    'organizer': 'text',
+    'category': 'dict',
+    'status': 'dict',
+    'source': 'dict',
+    'locationType': 'dict',
+    'city': 'dict',
+    'registrationDeadline': 'days',
+    'startDate': 'days',
+    'endDate': 'days',
+    'website': 'text',
+    'prizeTotal': 'int',
+    'teamMin': 'int',
+    'teamMax': 'int',
+    'contentHash': 'text'
+}
+DATE_COLUMNS = ('registrationDeadline', 'startDate', 'endDate')
+MISSING_DAYS = -2 ** 31
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Append-only, gzip-compressed JSON Lines copy of every document the scraper
+# writes (one gzip member per run) and the default columnar snapshot path
+BACKUP_PATH = 'data/scraped_hackathons.jsonl.gz'
+SNAPSHOT_PATH = 'data/hackathons.snapshot'
+
+SOA_MAGIC = b'HKSOA1\n\0'
+ARROW_MAGIC = b'ARROW1'
+PARQUET_MAGIC = b'PAR1'
+SNAPSHOT_FORMATS = ('arrow', 'parquet', 'soa')
+
+def iter_jsonl_gz(path):
+    """Yield every document in a gzip JSON Lines history, oldest first"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, zlib.error):
+            # A run that died mid-write leaves a truncated last member
+            print(f"[WARN] {path} ends in a truncated block, stopping there", file=sys.stderr)
+
+def latest_documents(documents):
+    """Collapse a history to the last copy of each title and website"""
+    latest = {}
+    for document in documents:
+        key = (document.get('title'), (document.get('links') or {}).get('website'))
+        latest[key] = document
+    return list(latest.values())
+
+def _to_days(value):
+    """'YYYY-MM-DD...' or a datetime to days since the epoch"""
+    if value is None or value == '':
+        return MISSING_DAYS
+    if hasattr(value, 'toordinal'):
+        return value.toordinal() - EPOCH_ORDINAL
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        return MISSING_DAYS
+
+def _from_days(days):
+    return None if days == MISSING_DAYS else date.fromordinal(days + EPOCH_ORDINAL).isoformat()
+
+def flatten_hackathon(hackathon):
+    """One snapshot row from a hackathon document"""
+    location = hackathon.get('location') or {}
+    team = hackathon.get('teamSize') or {}
+    prize_total = 0
+    for prize in hackathon.get('prizes') or []:
+        try:
+            prize_total += int(prize.get('amount') or 0)
+        except (TypeError, ValueError):
+            pass
+    return {
+        'title': hackathon.get('title') or '',
+        'organizer': hackathon.get('organizer') or '',
+        'category': hackathon.get('category') or '',
+        'status': hackathon.get('status') or '',
+        'source': hackathon.get('source') or '',
+        'locationType': location.get('type') or '',
+        'city': (location.get('address') or {}).get('city') or '',
+        'registrationDeadline': _to_days(hackathon.get('registrationDeadline')),
+        'startDate': _to_days(hackathon.get('startDate')),
+        'endDate': _to_days(hackathon.get('endDate')),
+        'website': (hackathon.get('links') or {}).get('website') or '',
+        'prizeTotal': prize_total,
+        'teamMin': int(team.get('min') or 0),
+        'teamMax': int(team.get('max') or 0),
+        'contentHash': hackathon.get('contentHash') or ''
+    }
+
+def _pad(f):
+    # Keep every column block 8-byte aligned for zero-copy casts
+    f.write(b'\0' * (-f.tell() % 8))
+
+def write_soa_snapshot(rows, path):
+    """Write rows in the struct-of-arrays format"""
+    columns = {}
+    blocks = []
+    for name, kind in SNAPSHOT_COLUMNS.items():
+        values = [row[name] for row in rows]
+        if kind == 'dict':
+            dictionary = sorted(set(values))
+            codes = {value: i for i, value in enumerate(dictionary)}
+            typecode = 'H' if len(dictionary) <= 1 << 16 else 'I'
+            columns[name] = {'kind': kind, 'values': dictionary, 'typecode': typecode}
+            blocks.append((name, 'codes', array.array(typecode, (codes[v] for v in values)).tobytes()))
+        elif kind == 'text':
+            encoded = [value.encode('utf-8') for value in values]
+            offsets = array.array('I', [0])
+            for value in encoded:
+                offsets.append(offsets[-1] + len(value))
+            columns[name] = {'kind': kind}
+            blocks.append((name, 'offsets', offsets.tobytes()))
+            blocks.append((name, 'data', b''.join(encoded)))
+        else:
+            columns[name] = {'kind': kind}
+            blocks.append((name, 'values', array.array('i' if kind == 'days' else 'q', values).tobytes()))
+
+    # Block offsets are relative to the 8-byte aligned end of the header
+    position = 0
+    for name, part, data in blocks:
+        columns[name][part] = [position, len(data)]
+        position += len(data) + (-len(data) % 8)
+    header = {'rows': len(rows), 'byteorder': sys.byteorder, 'columns': columns}
+    header_bytes = json.dumps(header).encode('utf-8')
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(SOA_MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        _pad(f)
+        for name, part, data in blocks:
+            f.write(data)
+            _pad(f)
+
+def _arrow_table(rows):
+    data = {name: [row[name] for row in rows] for name in SNAPSHOT_COLUMNS}
+    for name in DATE_COLUMNS:
+        data[name] = [None if days == MISSING_DAYS else date.fromordinal(days + EPOCH_ORDINAL)
+                      for days in data[name]]
+    arrays = {}
+    for name, kind in SNAPSHOT_COLUMNS.items():
+        if kind == 'dict':
+            arrays[name] = pyarrow.array(data[name], pyarrow.string()).dictionary_encode()
+        elif kind == 'days':
+            arrays[name] = pyarrow.array(data[name], pyarrow.date32())
+        elif kind == 'int':
+            arrays[name] = pyarrow.array(data[name], pyarrow.int64())
+        else:
+            arrays[name] = pyarrow.array(data[name], pyarrow.string())
+    return pyarrow.table(arrays)
+
+def write_snapshot(hackathons, path, fmt=None):
+    """
+    Write a columnar snapshot of hackathon documents and return its format.
+
+    fmt is one of SNAPSHOT_FORMATS; by default Arrow IPC when pyarrow is
+    installed and the struct-of-arrays format otherwise. The file is written
+    aside and renamed into place so readers never see half a snapshot.
+    """
+    fmt = fmt or ('arrow' if load_pyarrow() else 'soa')
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unknown snapshot format: {fmt}")
+    if fmt != 'soa' and load_pyarrow() is None:
+        raise ValueError(f"The {fmt} format needs pyarrow installed")
+    rows = [flatten_hackathon(hackathon) for hackathon in hackathons]
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + '.tmp'
+    if fmt == 'soa':
+        write_soa_snapshot(rows, temp_path)
+    elif fmt == 'parquet':
+        pyarrow.parquet.write_table(_arrow_table(rows), temp_path, compression='zstd')
+    else:
+        table = _arrow_table(rows)
+        with pyarrow.OSFile(temp_path, 'wb') as sink:
+            with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    os.replace(temp_path, path)
+    return fmt
+
+class SnapshotReader:
+    """
+    Memory-mapped, filterable view of a snapshot in any of SNAPSHOT_FORMATS.
+
+    filter() scans only the category, status and deadline columns it is
+    asked about; rows() materialises just the requested rows and columns.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic = f.read(8)
+        self.table = None
+        self.map = None
+        if magic.startswith(SOA_MAGIC):
+            self.format = 'soa'
+            self._open_soa()
+        elif magic.startswith(ARROW_MAGIC) or magic.startswith(PARQUET_MAGIC):
+            if load_pyarrow() is None:
+                raise ValueError(f"{path} is an Arrow/Parquet snapshot and pyarrow is not installed")
+            if magic.startswith(ARROW_MAGIC):
+                self.format = 'arrow'
+                self.table = pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
+            else:
+                self.format = 'parquet'
+                self.table = pyarrow.parquet.read_table(path, memory_map=True)
+            self.rows_count = self.table.num_rows
+        else:
+            raise ValueError(f"{path} is not a hackathon snapshot")
+
+    def _open_soa(self):
+        self.file = open(self.path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (header_length,) = struct.unpack_from('<Q', self.map, len(SOA_MAGIC))
+        start = len(SOA_MAGIC) + 8
+        self.header = json.loads(self.map[start:start + header_length])
+        self.data_start = start + header_length + (-(start + header_length) % 8)
+        self.rows_count = self.header['rows']
+        self.swap = self.header['byteorder'] != sys.byteorder
+        self.view = memoryview(self.map)
+        # Column blocks, read once each; the views among them are released in
+        # close() so the map can close while rows() generators are still alive
+        self.blocks = {}
+        self.views = []
+
+    def _block(self, name, part, typecode):
+        if (name, part) in self.blocks:
+            return self.blocks[name, part]
+        offset, length = self.header['columns'][name][part]
+        offset += self.data_start
+        block = self.view[offset:offset + length]
+        self.views.append(block)
+        if not self.swap:
+            values = block.cast(typecode)
+            self.views.append(values)
+        else:
+            values = array.array(typecode, block)
+            values.byteswap()
+        self.blocks[name, part] = values
+        return values
+
+    def _codes(self, name):
+        # Snapshots from before the typecode was recorded always used uint16
+        return self._block(name, 'codes', self.header['columns'][name].get('typecode', 'H'))
+
+    def __len__(self):
+        return self.rows_count
+
+    def close(self):
+        if self.map is not None:
+            for view in reversed(self.views):
+                view.release()
+            self.views = []
+            self.blocks = {}
+            self.view.release()
+            self.map.close()
+            self.file.close()
+            self.map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def filter(self, category=None, status=None, deadline_after=None, deadline_before=None):
+        """Indexes of rows matching every given condition (deadlines are inclusive ISO dates)"""
+        if self.table is not None:
+            return self._filter_arrow(category, status, deadline_after, deadline_before)
+
+        selected = None
+        for name, wanted in (('category', category), ('status', status)):
+            if wanted is None:
+                continue
+            dictionary = self.header['columns'][name]['values']
+            wanted = {wanted} if isinstance(wanted, str) else set(wanted)
+            wanted_codes = {i for i, value in enumerate(dictionary) if value in wanted}
+            codes = self._codes(name)
+            candidates = range(self.rows_count) if selected is None else selected
+            selected = [i for i in candidates if codes[i] in wanted_codes]
+        if deadline_after is not None or deadline_before is not None:
+            low = _to_days(deadline_after) if deadline_after else MISSING_DAYS + 1
+            high = _to_days(deadline_before) if deadline_before else 2 ** 31 - 1
+            days = self._block('registrationDeadline', 'values', 'i')
+            candidates = range(self.rows_count) if selected is None else selected
+            selected = [i for i in candidates if low <= days[i] <= high]
+        return list(range(self.rows_count)) if selected is None else selected
+
+    def _filter_arrow(self, category, status, deadline_after, deadline_before):
+        compute = pyarrow.compute
+        mask = None
+        conditions = []
+        for name, wanted in (('category', category), ('status', status)):
+            if wanted is not None:
+                wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+                column = self.table[name].cast(pyarrow.string())
+                conditions.append(compute.is_in(column, value_set=pyarrow.array(wanted, pyarrow.string())))
+        deadline = self.table['registrationDeadline']
+        if deadline_after:
+            conditions.append(compute.greater_equal(deadline, pyarrow.scalar(date.fromisoformat(deadline_after))))
+        if deadline_before:
+            conditions.append(compute.less_equal(deadline, pyarrow.scalar(date.fromisoformat(deadline_before))))
+        for condition in conditions:
+            mask = condition if mask is None else compute.and_(mask, condition)
+        if mask is None:
+            return list(range(self.rows_count))
+        return compute.indices_nonzero(compute.fill_null(mask, False)).to_pylist()
+
+    def rows(self, indexes=None, columns=None):
+        """Yield the given rows (default all) as dicts of the given columns (default all)"""
+        indexes = range(self.rows_count) if indexes is None else indexes
+        columns = list(columns or SNAPSHOT_COLUMNS)
+        if self.table is not None:
+            taken = self.table.select(columns).take(pyarrow.array(list(indexes), pyarrow.int64()))
+            for row in taken.to_pylist():
+                for name in DATE_COLUMNS:
+                    if row.get(name) is not None:
+                        row[name] = row[name].isoformat()
+                yield row
+            return
+
+        readers = {}
+        for name in columns:
+            kind = self.header['columns'][name]['kind']
+            if kind == 'dict':
+                codes = self._codes(name)
+                values = self.header['columns'][name]['values']
+                readers[name] = lambda i, codes=codes, values=values: values[codes[i]]
+            elif kind == 'text':
+                offsets = self._block(name, 'offsets', 'I')
+                offset = self.data_start + self.header['columns'][name]['data'][0]
+                readers[name] = lambda i, offsets=offsets, offset=offset: bytes(
+                    self.view[offset + offsets[i]:offset + offsets[i + 1]]
+                ).decode('utf-8')
+            elif kind == 'days':
+                days = self._block(name, 'values', 'i')
+                readers[name] = lambda i, days=days: _from_days(days[i])
+            else:
+                ints = self._block(name, 'values', 'q')
+                readers[name] = lambda i, ints=ints: ints[i]
+        for i in indexes:
+            yield {name: read(i) for name, read in readers.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filter a hackathon snapshot")
+    parser.add_argument('snapshot')
+    parser.add_argument('--category')
+    parser.add_argument('--status')
+    parser.add_argument('--deadline-after', help="YYYY-MM-DD, inclusive")
+    parser.add_argument('--deadline-before', help="YYYY-MM-DD, inclusive")
+    args = parser.parse_args()
+
+    with SnapshotReader(args.snapshot) as reader:
+        matches = reader.filter(args.category, args.status, args.deadline_after, args.deadline_before)
+        for row in reader.rows(matches):
+            print(json.dumps(row, ensure_ascii=False))
@@ -0,0 +1,250 @@
+"""
+Duplicate detection: URL canonicalisation, title MinHash matching and the
+card fingerprint indexes used to skip unchanged cards.
+"""
+import array
+import functools
+import hashlib
+import json
+import operator
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'lb'}
+
+# Near-duplicate detection: MinHash signature size, LSH band layout and the
+# estimated title similarity above which two listings count as the same
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+NEAR_DUPLICATE_THRESHOLD = 0.75
+MINHASH_BUCKET_LIMIT = 32
+NEAR_DUPLICATES = os.getenv('SCRAPER_NEAR_DUPLICATES', '') == '1'
+# Years and edition numbers ("2026", "3.0"); titles that differ in them are
+# different editions, however similar the rest is
+EDITION_NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+
+def normalize_title(title):
+    """Case- and whitespace-insensitive key for a title"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', title or '')).strip().casefold()
+
+def _untracked_query(query):
+    """Query parameters of a URL minus the click-tracking ones"""
+    return [(k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+            if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS]
+
+def canonical_url(url):
+    """
+    Key for a URL with scheme, host case, www., fragment, trailing slash,
+    tracking parameters and query parameter order ignored
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host:
+        return None
+    query = urlencode(sorted(_untracked_query(parts.query)))
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{query}" if query else '')
+
+def strip_tracking_params(url):
+    """Drop click-tracking query parameters from a URL"""
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(query=urlencode(_untracked_query(parts.query))))
+
+# An unsigned array typecode exactly 32 bits wide on this platform, so the
+# shake digest splits into the same hashes everywhere
+HASH_TYPECODE = next(code for code in 'IL' if array.array(code).itemsize == 4)
+
+@functools.lru_cache(maxsize=1 << 16)
+def _shingle_hashes(shingle):
+    """MINHASH_PERMUTATIONS independent 32-bit hashes of one shingle"""
+    digest = hashlib.shake_128(shingle.encode('utf-8')).digest(4 * MINHASH_PERMUTATIONS)
+    return array.array(HASH_TYPECODE, digest)
+
+def minhash_signature(text):
+    """MinHash signature over the character 3-grams of a normalised title"""
+    text = re.sub(r'[^0-9a-z]+', ' ', text)
+    shingles = {text[i:i + 3] for i in range(max(1, len(text) - 2))}
+    # Column-wise minimum across the shingles' hash rows
+    return tuple(map(min, zip(*map(_shingle_hashes, shingles))))
+
+class DedupeIndex:
+    """
+    Constant-time duplicate check keyed on normalised title and canonical URL.
+    
+    URLs in ignore_urls (the listing pages themselves, used as a card's link
+    when it has none) never count as identity. With near_duplicates, titles
+    are also compared by MinHash with LSH banding, so re-posts with slightly
+    different titles are caught while the cost per listing stays constant;
+    a match only counts when both titles carry the same edition numbers.
+    """
+
+    def __init__(self, ignore_urls=(), near_duplicates=None):
+        self.titles = set()
+        self.urls = set()
+        self.ignored_urls = {canonical_url(url) for url in ignore_urls}
+        self.near_duplicates = NEAR_DUPLICATES if near_duplicates is None else near_duplicates
+        self.signatures = []
+        self.editions = []
+        self.bands = defaultdict(list)
+
+    def _band_keys(self, signature):
+        rows = len(signature) // MINHASH_BANDS
+        return [(i, signature[i * rows:(i + 1) * rows]) for i in range(MINHASH_BANDS)]
+
+    def _is_near_duplicate(self, signature, editions):
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self.bands.get(key, ()))
+        for candidate in candidates:
+            if self.editions[candidate] != editions:
+                continue
+            matching = sum(map(operator.eq, signature, self.signatures[candidate]))
+            if matching / len(signature) >= NEAR_DUPLICATE_THRESHOLD:
+                return True
+        return False
+
+    def add(self, hackathon):
+        """Register a hackathon; return False if it duplicates one already added"""
+        title_key = normalize_title(hackathon.get('title'))
+        url_key = canonical_url((hackathon.get('links') or {}).get('website'))
+        if url_key in self.ignored_urls:
+            url_key = None
+        
+        if title_key in self.titles or (url_key and url_key in self.urls):
+            return False
+        
+        signature = None
+        if self.near_duplicates:
+            signature = minhash_signature(title_key)
+            editions = EDITION_NUMBER_PATTERN.findall(title_key)
+            if self._is_near_duplicate(signature, editions):
+                return False
+        
+        self.titles.add(title_key)
+        if url_key:
+            self.urls.add(url_key)
+        if signature:
+            self.signatures.append(signature)
+            self.editions.append(editions)
+            for key in self._band_keys(signature):
+                bucket = self.bands[key]
+                # A bucket this full only holds near-identical titles already;
+                # capping it keeps each lookup constant-time
+                if len(bucket) < MINHASH_BUCKET_LIMIT:
+                    bucket.append(len(self.signatures) - 1)
+        return True
+
+# Where content fingerprints of already-stored cards are kept: 'mongo' reads
+# the contentHash field of the hackathons collection, 'file' keeps a local
+# JSON index, 'off' reprocesses every card
+FINGERPRINT_BACKEND = os.getenv('SCRAPER_FINGERPRINTS', 'mongo')
+FINGERPRINT_FILE = 'data/fingerprints.json'
+FINGERPRINT_TTL_DAYS = 30
+
+# API item fields that make up a listing's visible content
+API_FINGERPRINT_FIELDS = (
+    'title', 'public_url', 'seo_url', 'start_date', 'end_date', 'regnRequirements',
+    'prizes', 'region', 'address_with_country_logo', 'organisation', 'filters', 'details'
+)
+
+def card_fingerprint(record):
+    """Stable content hash of a raw card record"""
+    if 'api_item' in record:
+        item = record['api_item']
+        content = json.dumps({k: item.get(k) for k in API_FINGERPRINT_FIELDS}, sort_keys=True, default=str)
+    else:
+        text = re.sub(r'\s+', ' ', record.get('text') or '').strip().lower()
+        href = record.get('href')
+        link = urljoin(record.get('page_url') or '', href) if href else ''
+        content = f"{text}\n{link}"
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+class MongoFingerprintIndex:
+    """
+    Known fingerprints read from the contentHash of stored hackathons.
+    
+    The set is a snapshot of the collection; stale() tells a long-lived
+    holder when documents have been deleted since it was read.
+    """
+
+    def __init__(self, hashes, collection=None):
+        self.known = set(hashes)
+        self.collection = collection
+        self.documents = collection.estimated_document_count() if collection is not None else 0
+
+    def seen(self, fingerprint):
+        return fingerprint in self.known
+
+    def stale(self):
+        """Whether the collection shrank since the last check (e.g. seed.js emptied it)"""
+        if self.collection is None:
+            return False
+        documents = self.collection.estimated_document_count()
+        shrank = documents < self.documents
+        self.documents = max(self.documents, documents)
+        return shrank
+
+    def commit(self, fingerprints):
+        # The upserts already stored contentHash alongside each document
+        self.known.update(fingerprints)
+
+class FileFingerprintIndex:
+    """Known fingerprints kept in a local JSON file with last-seen timestamps"""
+
+    def __init__(self, path=FINGERPRINT_FILE):
+        self.path = path
+        self.known = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.known = json.load(f)
+            except (OSError, ValueError):
+                print(f"[WARN] Ignoring unreadable fingerprint file {path}")
+
+    def seen(self, fingerprint):
+        if fingerprint in self.known:
+            self.known[fingerprint] = datetime.now().isoformat()
+            return True
+        return False
+
+    def stale(self):
+        # The file only changes through this index
+        return False
+
+    def commit(self, fingerprints):
+        """Record fingerprints whose documents were written and persist the index"""
+        now = datetime.now()
+        for fingerprint in fingerprints:
+            self.known[fingerprint] = now.isoformat()
+        cutoff = (now - timedelta(days=FINGERPRINT_TTL_DAYS)).isoformat()
+        self.known = {k: v for k, v in self.known.items() if v >= cutoff}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.known, f)
+
+def open_fingerprint_index(backend=None):
+    """Load the configured fingerprint index, or None when disabled or unavailable"""
+    backend = backend or FINGERPRINT_BACKEND
+    if backend == 'off':
+        return None
+    if backend == 'file':
+        return FileFingerprintIndex()
+    if backend != 'mongo':
+        raise ValueError(f"Unknown fingerprint backend: {backend}")
+    
+    try:
+        from .storage import get_hackathons_collection
+        collection = get_hackathons_collection()
+        cursor = collection.find({'contentHash': {'$exists': True}}, {'contentHash': 1, '_id': 0})
+        return MongoFingerprintIndex((doc['contentHash'] for doc in cursor), collection)
+    except Exception as e:
+        print(f"[WARN] Fingerprint index unavailable, processing every card: {type(e).__name__}")
+        return None
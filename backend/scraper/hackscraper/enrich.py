@@ -0,0 +1,192 @@
+"""
+Detail-page enrichment of estimated fields, with a conditional-request cache.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from .browser import CONTEXT_OPTIONS, SCRAPER_HOST_INTERVAL, BrowserSession, HostRateLimiter
+from .metrics import ScrapeMetrics
+from .parsing import DETAIL_FIELDS, STATUS_END_FIELDS, determine_hackathon_status
+
+# Detail-page enrichment: off by default, requests in flight at once, documents
+# enriched per round, and how long a cached detail page is trusted without
+# revalidating it (entries unseen for DETAIL_CACHE_TTL_DAYS are dropped)
+ENRICH_DETAILS = os.getenv('SCRAPER_ENRICH', '0') == '1'
+ENRICH_CONCURRENCY = int(os.getenv('SCRAPER_ENRICH_CONCURRENCY', '4'))
+ENRICH_CHUNK = 50
+DETAIL_CACHE_FILE = 'data/detail_cache.json'
+DETAIL_REVALIDATE_HOURS = 24
+DETAIL_CACHE_TTL_DAYS = 30
+
+class DetailCache:
+    """
+    Parsed detail pages kept in a local JSON file, keyed by URL.
+    
+    Each entry keeps the response's ETag and Last-Modified for conditional
+    requests, a hash of its body, the listing card hash it was fetched for
+    and the fields parsed from it.
+    """
+
+    def __init__(self, path=DETAIL_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                print(f"[WARN] Ignoring unreadable detail cache {path}")
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def put(self, url, entry):
+        self.entries[url] = entry
+
+    def save(self):
+        cutoff = (datetime.now() - timedelta(days=DETAIL_CACHE_TTL_DAYS)).isoformat()
+        self.entries = {k: v for k, v in self.entries.items() if v['fetched_at'] >= cutoff}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+
+def merge_detail(hackathon, fields):
+    """
+    Overwrite a hackathon's estimated fields with what its detail page said;
+    fields the listing itself provided are left alone
+    """
+    estimated = hackathon.get('estimatedFields') or []
+    filled = [name for name in DETAIL_FIELDS if name in estimated and fields.get(name)]
+    for name in filled:
+        hackathon[name] = fields[name]
+    hackathon['estimatedFields'] = [f for f in estimated if f not in filled]
+    if any(name in filled for name in STATUS_END_FIELDS):
+        hackathon['status'] = determine_hackathon_status(hackathon)
+
+class DetailEnricher:
+    """
+    Fills in estimated fields from each hackathon's detail page.
+    
+    Requests go through one pooled HTTP client, at most concurrency at a time
+    and spaced per host by the rate limiter. A cached page is reused without
+    a request while its listing card is unchanged and the entry is fresh;
+    otherwise it is revalidated with If-None-Match/If-Modified-Since, and a
+    200 whose body hash matches the cache is not parsed again.
+    """
+
+    def __init__(self, sources, cache, concurrency=None, host_interval=None, metrics=None):
+        self.sources = {source.name: source for source in sources}
+        self.cache = cache
+        self.concurrency = concurrency or ENRICH_CONCURRENCY
+        self.host_interval = SCRAPER_HOST_INTERVAL if host_interval is None else host_interval
+        self.metrics = metrics or ScrapeMetrics()
+        self.pool = self.rate_limiter = self.request_context = None
+
+    async def start(self, p):
+        # Created here, on the session's event loop, which they are bound to
+        self.pool = asyncio.Semaphore(self.concurrency)
+        self.rate_limiter = HostRateLimiter(self.host_interval)
+        self.request_context = await p.request.new_context(extra_http_headers={
+            'User-Agent': CONTEXT_OPTIONS['user_agent'],
+            'Accept': 'application/json, text/html;q=0.9'
+        })
+
+    async def close(self):
+        if self.request_context:
+            await self.request_context.dispose()
+
+    async def fetch_fields(self, source, url, listing_hash):
+        entry = self.cache.get(url)
+        if entry and entry.get('listing_hash') == listing_hash:
+            age = datetime.now() - datetime.fromisoformat(entry['fetched_at'])
+            if age < timedelta(hours=DETAIL_REVALIDATE_HOURS):
+                self.metrics.count('detail_cached')
+                return entry['fields']
+        
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        async with self.pool:
+            await self.rate_limiter.wait(url)
+            phase_start = time.perf_counter()
+            response = await self.request_context.get(url, headers=headers, fail_on_status_code=False)
+            body = await response.text() if response.ok else ''
+            self.metrics.record_phase('detail_fetch', phase_start)
+        
+        if response.status == 304 and entry:
+            self.metrics.count('detail_not_modified')
+            fields = entry['fields']
+        elif response.ok:
+            body_hash = hashlib.sha1(body.encode('utf-8')).hexdigest()
+            if entry and entry.get('body_hash') == body_hash:
+                self.metrics.count('detail_unchanged')
+                fields = entry['fields']
+            else:
+                self.metrics.count('detail_fetched')
+                fields = source.parse_detail(body, response.headers.get('content-type') or '')
+            entry = {
+                'etag': response.headers.get('etag'),
+                'last_modified': response.headers.get('last-modified'),
+                'body_hash': body_hash,
+                'fields': fields
+            }
+        else:
+            raise RuntimeError(f"detail page returned HTTP {response.status}")
+        
+        self.cache.put(url, {**entry, 'listing_hash': listing_hash, 'fetched_at': datetime.now().isoformat()})
+        return fields
+
+    async def enrich_one(self, hackathon):
+        source = self.sources.get(hackathon.get('source'))
+        if not hackathon.get('estimatedFields') or not source:
+            return
+        url = source.detail_url(hackathon)
+        if not url:
+            return
+        try:
+            merge_detail(hackathon, await self.fetch_fields(source, url, hackathon.get('contentHash')))
+        except Exception as e:
+            # The listing data is still worth saving without its details
+            self.metrics.error('detail', e)
+
+    async def enrich(self, hackathons):
+        phase_start = time.perf_counter()
+        await asyncio.gather(*(self.enrich_one(hackathon) for hackathon in hackathons))
+        self.metrics.record_phase('enrichment', phase_start)
+        return hackathons
+
+def iter_enriched(hackathons, sources, session=None, concurrency=None, host_interval=None,
+                  metrics=None, cache=None):
+    """
+    Yield hackathons with their estimated fields filled in from detail pages.
+    
+    Documents are enriched ENRICH_CHUNK at a time, concurrently within each
+    round, and come out in the order they went in. The requests run on the
+    session's event loop, or on a short-lived driver-only session (Chromium
+    itself is never launched for this).
+    """
+    own_session = session is None
+    session = session or BrowserSession().start()
+    cache = cache or DetailCache()
+    enricher = DetailEnricher(sources, cache, concurrency, host_interval, metrics)
+    session.submit(enricher.start(session.playwright)).result()
+    try:
+        chunk = []
+        for hackathon in hackathons:
+            chunk.append(hackathon)
+            if len(chunk) >= ENRICH_CHUNK:
+                yield from session.submit(enricher.enrich(chunk)).result()
+                chunk = []
+        if chunk:
+            yield from session.submit(enricher.enrich(chunk)).result()
+    finally:
+        session.submit(enricher.close()).result()
+        cache.save()
+        if own_session:
+            session.close()
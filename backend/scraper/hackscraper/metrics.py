@@ -0,0 +1,126 @@
+"""
+Per-run scrape metrics, written as a JSON log line and optionally a
+Prometheus textfile.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+# Each run's metrics are appended here as one JSON line; the Prometheus
+# text-format file (for node_exporter's textfile collector) is optional
+METRICS_LOG = os.getenv('SCRAPER_METRICS_LOG', 'data/scrape_metrics.jsonl')
+PROMETHEUS_FILE = os.getenv('SCRAPER_PROMETHEUS_FILE', '')
+METRICS_ERROR_SAMPLES = 5
+
+class ScrapeMetrics:
+    """
+    Stage timings, counters and retries for one scrape run.
+    
+    Updated from both the browser thread and the parsing/writing side, so
+    every update takes the lock. Stage seconds add up across pages and
+    sources; a few error messages are kept as samples.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = datetime.utcnow()
+        self.run_start = time.perf_counter()
+        self.stages = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.retries = defaultdict(int)
+        self.errors = []
+        self.sources = []
+        self.info = {}
+
+    def record_phase(self, name, started):
+        """Add the seconds elapsed since started to the named stage"""
+        self.add_time(name, time.perf_counter() - started)
+
+    def add_time(self, name, seconds):
+        """Add seconds measured elsewhere (e.g. in a worker process) to the named stage"""
+        with self.lock:
+            self.stages[name] += seconds
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def retry(self, stage):
+        with self.lock:
+            self.retries[stage] += 1
+
+    def error(self, stage, error):
+        """Count a failure and keep its message if samples are still short"""
+        with self.lock:
+            self.counters['errored'] += 1
+            if len(self.errors) < METRICS_ERROR_SAMPLES:
+                self.errors.append(f"{stage}: {type(error).__name__}: {str(error)[:80]}")
+
+    def add_source(self, result):
+        with self.lock:
+            self.sources.append(result)
+
+    def set_info(self, name, value):
+        """Attach a JSON-serialisable detail about the run to the snapshot"""
+        with self.lock:
+            self.info[name] = value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'started_at': self.started_at.isoformat(),
+                'duration_s': round(time.perf_counter() - self.run_start, 3),
+                'stages_s': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+                'counters': dict(self.counters),
+                'retries': dict(self.retries),
+                'sources': list(self.sources),
+                'info': dict(self.info),
+                'errors': list(self.errors)
+            }
+
+    @staticmethod
+    def to_prometheus(snapshot):
+        """Render a snapshot in the Prometheus text exposition format"""
+        lines = [
+            '# HELP scraper_run_duration_seconds Wall time of the last scrape run.',
+            '# TYPE scraper_run_duration_seconds gauge',
+            f"scraper_run_duration_seconds {snapshot['duration_s']}",
+            '# HELP scraper_last_run_timestamp_seconds When the last scrape run finished.',
+            '# TYPE scraper_last_run_timestamp_seconds gauge',
+            f"scraper_last_run_timestamp_seconds {time.time():.0f}",
+            '# HELP scraper_stage_seconds Seconds spent per stage in the last scrape run.',
+            '# TYPE scraper_stage_seconds gauge'
+        ]
+        lines += [f'scraper_stage_seconds{{stage="{name}"}} {seconds}'
+                  for name, seconds in sorted(snapshot['stages_s'].items())]
+        lines += ['# HELP scraper_items Items counted per kind in the last scrape run.',
+                  '# TYPE scraper_items gauge']
+        lines += [f'scraper_items{{kind="{name}"}} {value}'
+                  for name, value in sorted(snapshot['counters'].items())]
+        lines += ['# HELP scraper_retries Retries per stage in the last scrape run.',
+                  '# TYPE scraper_retries gauge']
+        lines += [f'scraper_retries{{stage="{name}"}} {value}'
+                  for name, value in sorted(snapshot['retries'].items())]
+        return '\n'.join(lines) + '\n'
+
+    def emit(self, log_path=None, prometheus_path=None):
+        """Print the run's metrics as a JSON log line and write the configured files"""
+        log_path = METRICS_LOG if log_path is None else log_path
+        prometheus_path = PROMETHEUS_FILE if prometheus_path is None else prometheus_path
+        snapshot = self.snapshot()
+        line = json.dumps({'event': 'scrape_run', **snapshot})
+        print(line)
+        if log_path:
+            os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        if prometheus_path:
+            os.makedirs(os.path.dirname(prometheus_path) or '.', exist_ok=True)
+            # Written aside and renamed so a collector never reads half a file
+            with open(prometheus_path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus(snapshot))
+            os.replace(prometheus_path + '.tmp', prometheus_path)
+        return snapshot
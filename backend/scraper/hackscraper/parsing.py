@@ -0,0 +1,605 @@
+"""
+Card and listing API parsing: the text extraction helpers, the hackathon
+document builders, detail-page parsing and the parse stage, which can run on
+a process pool.
+"""
+import html
+import json
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from urllib.parse import urljoin, urlsplit
+
+from .dedupe import strip_tracking_params
+from .metrics import ScrapeMetrics
+
+# Card keyword -> category, first match wins
+CATEGORIES_MAP = {
+    'ai': 'AI/ML', 'ml': 'AI/ML', 'machine learning': 'AI/ML',
+    'web': 'Web Development', 'frontend': 'Web Development', 'backend': 'Web Development',
+    'mobile': 'Mobile Development', 'app': 'Mobile Development', 'android': 'Mobile Development', 'ios': 'Mobile Development',
+    'blockchain': 'Blockchain', 'crypto': 'Blockchain',
+    'iot': 'IoT', 'hardware': 'IoT',
+    'game': 'Game Development', 'gaming': 'Game Development',
+    'data': 'Data Science', 'analytics': 'Data Science',
+    'cyber': 'Cybersecurity', 'security': 'Cybersecurity',
+    'design': 'Design', 'ui': 'Design', 'ux': 'Design'
+}
+
+# Institution names first, then a "City, State" pair. Both only start at the
+# beginning of a run of letters, which gives the same leftmost match as an
+# unanchored search without retrying from every character of the run
+LOCATION_PATTERNS = [
+    r'((?<![A-Za-z\s])[A-Za-z\s]+(?:University|Institute|College|IIT|NIT|IIIT)[A-Za-z\s,]*)',
+    r'((?<![A-Za-z\s])[A-Za-z\s]+,\s*[A-Za-z\s]+)',
+]
+
+# Keywords this short must be whole words; longer ones match as word prefixes
+# ("cyber" in "cybersecurity")
+SHORT_KEYWORD_LENGTH = 3
+
+DEFAULT_TEAM_SIZE = {"min": 1, "max": 5}
+
+class CardParser:
+    """
+    Extracts every structured field from a card's text.
+    
+    Deadline, prize, team size, closed markers and category keywords are all
+    alternatives of one precompiled pattern run over the lower-cased text, so
+    it is scanned once for them; the location patterns run after it. Category
+    keywords are anchored at word boundaries, so "app" no longer matches inside
+    "happening" nor "ui" inside "build".
+    """
+
+    def __init__(self, categories_map=None):
+        self.categories_map = {k.lower(): v for k, v in (categories_map or CATEGORIES_MAP).items()}
+        self.keyword_priority = {keyword: i for i, keyword in enumerate(self.categories_map)}
+        keywords = self._keyword_pattern(self.categories_map)
+        self.scanner = re.compile(
+            r'(?P<days>\d+)\s*days?\s*left'
+            r'|₹(?P<prize>[\d,]+)'
+            r'|team\s*size:?\s*(?P<team_min>\d+)\s*-?\s*(?P<team_max>\d+)?'
+            r'|(?P<member_min>\d+)\s*-?\s*(?P<member_max>\d+)?\s*members?'
+            r'|\b(?P<closed>closed|ended|finished)\b'
+            r'|\b(?P<category>' + keywords + r')'
+        )
+        self.category_pattern = re.compile(r'\b(' + keywords + r')')
+        self.location_patterns = [re.compile(p, re.IGNORECASE) for p in LOCATION_PATTERNS]
+        self.whitespace = re.compile(r'\s+')
+
+    @staticmethod
+    def _keyword_pattern(categories_map):
+        """Alternation of all keywords, longest first so overlaps pick the longer one"""
+        keywords = sorted(categories_map, key=len, reverse=True)
+        return '|'.join(
+            re.escape(k) + r'(?=s?\b)' if len(k) <= SHORT_KEYWORD_LENGTH else re.escape(k)
+            for k in keywords
+        )
+
+    def category(self, text):
+        """Category of the highest-priority keyword found in text"""
+        keywords = {match.group(1) for match in self.category_pattern.finditer(text.lower())}
+        if not keywords:
+            return "Other"
+        return self.categories_map[min(keywords, key=self.keyword_priority.get)]
+
+    def parse(self, text, now=None):
+        """Return deadline, prize, location, team_size, closed and category for a card"""
+        now = now or datetime.now()
+        days_left = prize = team = members = None
+        closed = False
+        best_keyword = None
+        
+        for match in self.scanner.finditer(text.lower()):
+            group = match.lastgroup
+            if group == 'days':
+                if days_left is None:
+                    days_left = int(match.group('days'))
+            elif group == 'prize':
+                if prize is None:
+                    prize = f"₹{match.group('prize')}"
+            elif group in ('team_min', 'team_max'):
+                if team is None:
+                    team = (match.group('team_min'), match.group('team_max'))
+            elif group in ('member_min', 'member_max'):
+                if members is None:
+                    members = (match.group('member_min'), match.group('member_max'))
+            elif group == 'closed':
+                closed = True
+            elif group == 'category':
+                keyword = match.group('category')
+                if best_keyword is None or self.keyword_priority[keyword] < self.keyword_priority[best_keyword]:
+                    best_keyword = keyword
+        
+        deadline = now + timedelta(days=days_left) if days_left is not None else None
+        
+        team_size = dict(DEFAULT_TEAM_SIZE)
+        sizes = team or members
+        if sizes:
+            team_size = {"min": int(sizes[0]), "max": int(sizes[1] or sizes[0])}
+        
+        location = None
+        for pattern in self.location_patterns:
+            match = pattern.search(text)
+            if match:
+                location = self.whitespace.sub(' ', match.group(1).strip())
+                break
+        
+        return {
+            "deadline": deadline.strftime('%Y-%m-%d') if deadline else None,
+            "prize": prize,
+            "location": location,
+            "team_size": team_size,
+            "closed": closed,
+            "category": self.categories_map[best_keyword] if best_keyword else "Other"
+        }
+
+# Shared parser; patterns are compiled once at import
+CARD_PARSER = CardParser()
+
+def extract_date_from_text(text):
+    """Extract date from text containing 'days left' or similar patterns"""
+    return CARD_PARSER.parse(text)['deadline']
+
+def extract_prize_from_text(text):
+    """Extract prize amount from text"""
+    return CARD_PARSER.parse(text)['prize']
+
+def extract_location_from_text(text):
+    """Extract location/organizer from text"""
+    return CARD_PARSER.parse(text)['location']
+
+def extract_team_size(text):
+    """Extract team size from text"""
+    return CARD_PARSER.parse(text)['team_size']
+
+# A hackathon runs, in whole days, from its start date through its end date;
+# a missing one falls back to the first of the other dates that is set
+STATUS_START_FIELDS = ('startDate', 'registrationDeadline', 'endDate')
+STATUS_END_FIELDS = ('endDate', 'startDate', 'registrationDeadline')
+
+def _status_day(value):
+    """A stored date (datetime or 'YYYY-MM-DD...' string) as a date, or None"""
+    if isinstance(value, datetime):
+        return value.date()
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d').date() if value else None
+    except (TypeError, ValueError):
+        return None
+
+def determine_hackathon_status(dates, today=None):
+    """
+    upcoming, ongoing or completed for a document's startDate, endDate and
+    registrationDeadline, as of today (a date, default the UTC date).
+    Mirrors the queries recompute_statuses runs.
+    """
+    today = today or datetime.utcnow().date()
+    start = next(filter(None, (_status_day(dates.get(f)) for f in STATUS_START_FIELDS)), None)
+    end = next(filter(None, (_status_day(dates.get(f)) for f in STATUS_END_FIELDS)), None)
+    if end and end < today:
+        return "completed"
+    if start and start <= today:
+        return "ongoing"
+    return "upcoming"
+
+def status_from_deadline(deadline_date, text='', today=None):
+    """
+    The old determine_hackathon_status(deadline_date, text): status from a
+    'YYYY-MM-DD' deadline (or None), completed when the card text says closed
+    """
+    if CARD_PARSER.parse(text or '')['closed']:
+        return "completed"
+    return determine_hackathon_status({'registrationDeadline': deadline_date}, today)
+
+def build_hackathon_info(record):
+    """Turn a raw card record from EXTRACT_CARDS_JS into a hackathon document"""
+    if 'api_item' in record:
+        return build_hackathon_info_from_api(record['api_item'], record.get('page_url'))
+    
+    card_text = (record.get('text') or '').strip()
+    
+    if not card_text or len(card_text) < 30:
+        return None
+    
+    # Extract title
+    title = "Unknown Hackathon"
+    for title_text in record.get('titles') or []:
+        if title_text and len(title_text) > 3:
+            title = title_text[:150]
+            break
+    
+    # If no title found, use first line
+    if title == "Unknown Hackathon":
+        lines = [line.strip() for line in card_text.split('\n') if line.strip()]
+        for line in lines:
+            if len(line) > 10 and len(line) < 100:
+                title = line[:100]
+                break
+    
+    # Extract link
+    page_url = record.get('page_url') or 'https://unstop.com/hackathons'
+    link = page_url
+    href = record.get('href')
+    if href:
+        link = strip_tracking_params(urljoin(page_url, href))
+    
+    # Extract other information in one pass over the text
+    fields = CARD_PARSER.parse(card_text)
+    prize = fields['prize']
+    deadline_date = fields['deadline']
+    location_text = fields['location']
+    team_size = fields['team_size']
+    category = fields['category']
+    
+    # Calculate dates with proper fallbacks, noting which ones are guesses
+    # for the detail-page enrichment to replace
+    # A card never gives prize amounts, and its team size may be the default
+    estimated = ['description', 'startDate', 'endDate', 'prizes']
+    if team_size == DEFAULT_TEAM_SIZE:
+        estimated.append('teamSize')
+    if deadline_date:
+        reg_deadline = deadline_date
+        # Set start date 1 day after deadline
+        start = datetime.strptime(deadline_date, '%Y-%m-%d') + timedelta(days=1)
+        start_date = start.strftime('%Y-%m-%d')
+        # Set end date 3 days after start
+        end = start + timedelta(days=3)
+        end_date = end.strftime('%Y-%m-%d')
+    elif fields['closed']:
+        # A closed card is over: guess dates in the past, so its status comes
+        # from the same rule recompute_statuses applies later
+        estimated.append('registrationDeadline')
+        reg_deadline = (datetime.now() - timedelta(days=6)).strftime('%Y-%m-%d')
+        start_date = (datetime.now() - timedelta(days=5)).strftime('%Y-%m-%d')
+        end_date = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d')
+    else:
+        # Default dates
+        estimated.append('registrationDeadline')
+        reg_deadline = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+        start_date = (datetime.now() + timedelta(days=31)).strftime('%Y-%m-%d')
+        end_date = (datetime.now() + timedelta(days=34)).strftime('%Y-%m-%d')
+    
+    # Determine location type
+    location_type = "online"
+    if location_text:
+        loc_lower = location_text.lower()
+        if any(word in loc_lower for word in ['online', 'virtual', 'remote']):
+            location_type = "online"
+        else:
+            location_type = "offline"
+    
+    return {
+        "title": title,
+        "description": f"Hackathon found on Unstop: {title}",
+        "organizer": "Unstop",
+        "category": category,
+        "difficulty": "Intermediate",  # Default difficulty
+        "startDate": start_date,
+        "endDate": end_date,
+        "registrationDeadline": reg_deadline,
+        "location": {
+            "type": location_type,
+            "venue": location_text or "Online Platform",
+            "address": {
+                "city": location_text or "Online",
+                "state": "",
+                "country": "India"
+            }
+        },
+        "teamSize": team_size,
+        "status": determine_hackathon_status(
+            {'startDate': start_date, 'endDate': end_date, 'registrationDeadline': reg_deadline}
+        ),
+        "links": {
+            "website": link
+        },
+        "prizes": [{
+            "position": "Winner",
+            "amount": 0,
+            "currency": "INR",
+            "description": prize or "To be announced"
+        }] if prize else [],
+        "tags": [category],
+        "featured": False,
+        "views": 0,
+        "estimatedFields": estimated,
+        "scraped_at": datetime.now().isoformat()
+    }
+
+# Structured listing API the Unstop page itself calls for its cards
+UNSTOP_API_URL = os.getenv('UNSTOP_API_URL', 'https://unstop.com/api/public/opportunity/search-result')
+UNSTOP_API_PATH = urlsplit(UNSTOP_API_URL).path
+API_PER_PAGE = 18
+API_MAX_PAGES = int(os.getenv('SCRAPER_API_MAX_PAGES', '20'))
+
+def parse_api_payload(payload):
+    """Return (items, last_page) from a listing API response body"""
+    data = (payload or {}).get('data') or {}
+    if isinstance(data, list):
+        return data, 1
+    return data.get('data') or [], data.get('last_page') or 1
+
+def _api_date(value):
+    """Cut an API timestamp like '2025-01-12T23:59:00+05:30' down to YYYY-MM-DD"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+    except ValueError:
+        match = re.match(r'\d{4}-\d{2}-\d{2}', value)
+        return match.group(0) if match else None
+
+def _strip_html(value):
+    """Flatten an HTML fragment to plain text"""
+    text = re.sub(r'<[^>]+>', ' ', value or '')
+    return re.sub(r'\s+', ' ', html.unescape(text)).strip()
+
+def build_hackathon_info_from_api(item, page_url=None):
+    """Turn one listing API item into a hackathon document"""
+    title = (item.get('title') or '').strip()[:150]
+    if not title:
+        return None
+    
+    regn = item.get('regnRequirements') or {}
+    reg_deadline = _api_date(regn.get('end_regn_dt'))
+    start_date = _api_date(item.get('start_date'))
+    end_date = _api_date(item.get('end_date'))
+    
+    # Same fallbacks as the DOM path when the API leaves a date out
+    estimated = [name for name, value in (
+        ('registrationDeadline', reg_deadline), ('startDate', start_date), ('endDate', end_date)
+    ) if not value]
+    if reg_deadline and not start_date:
+        start_date = (datetime.strptime(reg_deadline, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+    if not reg_deadline:
+        reg_deadline = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+    if not start_date:
+        start_date = (datetime.now() + timedelta(days=31)).strftime('%Y-%m-%d')
+    if not end_date:
+        end_date = (datetime.strptime(start_date, '%Y-%m-%d') + timedelta(days=3)).strftime('%Y-%m-%d')
+    
+    # Category from the listing's own filter tags, then the title
+    filter_names = ' '.join(f.get('name', '') for f in item.get('filters') or [] if isinstance(f, dict))
+    category = CARD_PARSER.category(f"{filter_names} {title}")
+    
+    address = item.get('address_with_country_logo') or {}
+    country = address.get('country')
+    if isinstance(country, dict):
+        country = country.get('name')
+    city = address.get('city') or ''
+    location_type = "offline" if item.get('region') == 'offline' else "online"
+    
+    prizes = []
+    for prize in item.get('prizes') or []:
+        cash = prize.get('cash') or 0
+        try:
+            amount = int(float(cash))
+        except (TypeError, ValueError):
+            amount = 0
+        prizes.append({
+            "position": prize.get('rank') or "Winner",
+            "amount": amount,
+            "currency": prize.get('currency') or "INR",
+            "description": prize.get('others') or (f"₹{amount:,}" if amount else "To be announced")
+        })
+    
+    if not prizes:
+        estimated.append('prizes')
+    if not (regn.get('min_team_size') or regn.get('max_team_size')):
+        estimated.append('teamSize')
+    
+    organisation = item.get('organisation') or {}
+    if item.get('seo_url'):
+        link = item['seo_url']
+    elif item.get('public_url'):
+        link = urljoin('https://unstop.com/', item['public_url'])
+    else:
+        link = page_url or 'https://unstop.com/hackathons'
+    link = strip_tracking_params(link)
+    description = _strip_html(item.get('details'))[:1000]
+    if not description:
+        estimated.append('description')
+        description = f"Hackathon found on Unstop: {title}"
+    
+    return {
+        "title": title,
+        "description": description,
+        "organizer": organisation.get('name') or "Unstop",
+        "category": category,
+        "difficulty": "Intermediate",  # Default difficulty
+        "startDate": start_date,
+        "endDate": end_date,
+        "registrationDeadline": reg_deadline,
+        "location": {
+            "type": location_type,
+            "venue": city or "Online Platform",
+            "address": {
+                "city": city or "Online",
+                "state": address.get('state') or "",
+                "country": country or "India"
+            }
+        },
+        "teamSize": {
+            "min": int(regn.get('min_team_size') or 1),
+            "max": int(regn.get('max_team_size') or regn.get('min_team_size') or 5)
+        },
+        "status": determine_hackathon_status(
+            {'startDate': start_date, 'endDate': end_date, 'registrationDeadline': reg_deadline}
+        ),
+        "links": {
+            "website": link
+        },
+        "prizes": prizes,
+        "tags": [category],
+        "featured": False,
+        "views": 0,
+        "estimatedFields": estimated,
+        "scraped_at": datetime.now().isoformat()
+    }
+
+# Fields a detail page can fill in for a listing card
+DETAIL_FIELDS = ('description', 'startDate', 'endDate', 'registrationDeadline', 'prizes', 'teamSize')
+
+JSON_LD_PATTERN = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL
+)
+META_DESCRIPTION_PATTERN = re.compile(
+    r'<meta[^>]+(?:name|property)=["\'](?:og:)?description["\'][^>]+content=["\']([^"\']*)', re.IGNORECASE
+)
+EVENT_TYPES = {'Event', 'Hackathon', 'EducationEvent', 'BusinessEvent'}
+
+def _json_ld_event(page_html):
+    """The first schema.org event described in the page's JSON-LD blocks"""
+    for block in JSON_LD_PATTERN.findall(page_html):
+        try:
+            data = json.loads(block.strip())
+        except ValueError:
+            continue
+        nodes = data if isinstance(data, list) else [data]
+        nodes = [n for node in nodes if isinstance(node, dict) for n in node.get('@graph', [node])]
+        for node in nodes:
+            types = node.get('@type')
+            types = set(types) if isinstance(types, list) else {types}
+            if types & EVENT_TYPES or 'startDate' in node:
+                return node
+    return None
+
+def parse_detail_html(page_html):
+    """Dates, description, prize and team size from a server-rendered detail page"""
+    fields = {}
+    event = _json_ld_event(page_html) or {}
+    for name, key in (('startDate', 'startDate'), ('endDate', 'endDate')):
+        value = _api_date(event.get(key))
+        if value:
+            fields[name] = value
+    
+    description = _strip_html(event.get('description'))
+    if not description:
+        match = META_DESCRIPTION_PATTERN.search(page_html)
+        description = html.unescape(match.group(1)).strip() if match else ''
+    if description:
+        fields['description'] = description[:1000]
+    
+    # The card parser's prize and team patterns work on the page text too
+    text = _strip_html(re.sub(r'<(script|style)[^>]*>.*?</\1>', ' ', page_html, flags=re.IGNORECASE | re.DOTALL))
+    parsed = CARD_PARSER.parse(text)
+    if parsed['prize']:
+        amount = int(re.sub(r'\D', '', parsed['prize']) or 0)
+        fields['prizes'] = [{
+            "position": "Winner",
+            "amount": amount,
+            "currency": "INR",
+            "description": parsed['prize']
+        }]
+    if parsed['team_size'] != DEFAULT_TEAM_SIZE:
+        fields['teamSize'] = parsed['team_size']
+    return fields
+
+def normalize_hackathon(hackathon, source):
+    """Bring a mapped document into the shape shared by every source"""
+    if not hackathon:
+        return None
+    title = re.sub(r'\s+', ' ', hackathon.get('title') or '').strip()
+    if not title:
+        return None
+    hackathon['title'] = title
+    hackathon['organizer'] = hackathon.get('organizer') or source.organizer
+    tags = [tag for tag in hackathon.get('tags') or [] if tag]
+    if source.organizer and source.organizer not in tags:
+        tags.append(source.organizer)
+    hackathon['tags'] = tags
+    hackathon['source'] = source.name
+    hackathon.setdefault('scraped_at', datetime.now().isoformat())
+    return hackathon
+
+# Parsing stage: worker processes (1 parses in this process, 0 uses every
+# core) and the records handed to a worker at a time
+PARSE_WORKERS = int(os.getenv('SCRAPER_PARSE_WORKERS', '1'))
+PARSE_CHUNK = int(os.getenv('SCRAPER_PARSE_CHUNK', '250'))
+
+def parse_records(pairs):
+    """
+    Map and normalise (source, raw record) pairs into hackathon documents.
+    
+    Pure, so chunks can be parsed in worker processes. Returns one
+    (hackathon or None, exception or None) per pair, in order, and the
+    seconds spent.
+    """
+    started = time.perf_counter()
+    results = []
+    for source, record in pairs:
+        try:
+            results.append((normalize_hackathon(source.map_record(record), source), None))
+        except Exception as e:
+            results.append((None, e))
+    return results, time.perf_counter() - started
+
+def iter_parsed(items, workers=None, chunk_size=None, metrics=None):
+    """
+    Yield (item, hackathon, error) for (source, record, ...) items, in input order.
+    
+    With more than one worker, chunks of chunk_size items are parsed by
+    parse_records in a spawned process pool while the next chunk is still
+    being collected; results are released strictly in submission order.
+    Without a pool (one worker, or if it cannot start or breaks) each record
+    is parsed and yielded as it arrives, so downstream writes keep streaming.
+    """
+    workers = PARSE_WORKERS if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or PARSE_CHUNK
+    metrics = metrics or ScrapeMetrics()
+    executor = None
+    if workers > 1:
+        import concurrent.futures
+        import multiprocessing
+        try:
+            # Spawned, not forked: the parent runs the browser and MongoDB threads
+            executor = concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        except (OSError, NotImplementedError, ImportError) as e:
+            print(f"[WARN] Process pool unavailable ({type(e).__name__}), parsing serially")
+    in_flight = deque()
+    
+    def results_of(chunk, future=None):
+        nonlocal executor
+        pairs = [item[:2] for item in chunk]
+        try:
+            results, seconds = future.result() if future else parse_records(pairs)
+        except Exception as e:
+            # Broken pool or an unpicklable record: redo this chunk here
+            if executor:
+                print(f"[WARN] Parse worker failed ({type(e).__name__}), parsing serially")
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = None
+            results, seconds = parse_records(pairs)
+        metrics.add_time('parsing', seconds)
+        return [(item, hackathon, error) for item, (hackathon, error) in zip(chunk, results)]
+    
+    def submit(chunk):
+        if executor:
+            in_flight.append((chunk, executor.submit(parse_records, [item[:2] for item in chunk])))
+            # Keep every worker busy without queueing the whole scrape
+            while in_flight and (in_flight[0][1].done() or len(in_flight) > workers * 2):
+                yield from results_of(*in_flight.popleft())
+        else:
+            while in_flight:
+                yield from results_of(*in_flight.popleft())
+            yield from results_of(chunk)
+    
+    try:
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if executor is None or len(chunk) >= chunk_size:
+                yield from submit(chunk)
+                chunk = []
+        if chunk:
+            yield from submit(chunk)
+        while in_flight:
+            yield from results_of(*in_flight.popleft())
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,281 @@
+"""
+The scrape pipeline: sources run concurrently, their records are parsed,
+deduplicated, enriched and written in batches.
+"""
+import asyncio
+import concurrent.futures
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+
+from .dataset_export import BACKUP_PATH
+from .dedupe import DedupeIndex
+from .enrich import ENRICH_DETAILS, iter_enriched
+from .metrics import ScrapeMetrics
+from .parsing import iter_parsed
+from .sources import build_sources
+from .storage import DEFAULT_BATCH_SIZE, MongoBatchWriter, MongoJSONEncoder, get_hackathons_collection
+
+async def run_source(source, emit, session=None, **scrape_options):
+    """
+    Run one source's fetch under its timeout.
+    
+    A source that fails or times out is logged and cut short; records it
+    emitted before that are kept and the other sources carry on.
+    """
+    started = time.perf_counter()
+    emitted = 0
+    error = failure = None
+    
+    async def emit_records(records):
+        nonlocal emitted
+        emitted += len(records)
+        await emit(source, records)
+    
+    try:
+        await asyncio.wait_for(source.fetch(emit_records, session=session, **scrape_options), source.timeout)
+    except asyncio.TimeoutError as e:
+        error = f"timed out after {source.timeout:.0f}s"
+        failure = e
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e)[:80]}"
+        failure = e
+    
+    elapsed = time.perf_counter() - started
+    if error:
+        print(f"[ERROR] Source '{source.name}' {error} ({emitted} records kept)")
+    else:
+        print(f"[OK] Source '{source.name}': {emitted} records in {elapsed:.1f}s")
+    result = {'source': source.name, 'records': emitted, 'seconds': round(elapsed, 3), 'error': error}
+    metrics = scrape_options.get('metrics')
+    if metrics:
+        metrics.add_source(result)
+        if failure:
+            metrics.error(f"source {source.name}", failure)
+    return result
+
+async def run_sources(sources, emit, session=None, **scrape_options):
+    """Run every source concurrently; emit receives (source, records)"""
+    return await asyncio.gather(*(
+        run_source(source, emit, session, **scrape_options) for source in sources
+    ))
+
+# Pages of raw records allowed to queue up between the browser thread and the
+# parsing/writing side before the browser waits
+RECORD_QUEUE_PAGES = 4
+
+_PRODUCER_DONE = object()
+
+def iter_source_records(sources, session=None, **scrape_options):
+    """
+    Yield (source, raw record) pairs while the sources are still scraping.
+    
+    The sources run on one event loop in a background thread (the session's,
+    when one is given) and hand pages over through a bounded queue, so only a
+    few pages are ever held in memory at once. Options are those of
+    produce_card_records.
+    """
+    pages = queue.Queue(maxsize=RECORD_QUEUE_PAGES)
+    stopped = threading.Event()
+    
+    def put(item):
+        # Gives up once the consumer has gone away instead of blocking forever
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    async def emit(source, records):
+        if records:
+            await asyncio.to_thread(put, (source, records))
+    
+    async def produce():
+        try:
+            await run_sources(sources, emit, session, **scrape_options)
+        finally:
+            await asyncio.to_thread(put, _PRODUCER_DONE)
+    
+    if session:
+        producer = session.submit(produce())
+    else:
+        producer = concurrent.futures.Future()
+        
+        def run():
+            try:
+                producer.set_result(asyncio.run(produce()))
+            except BaseException as e:
+                producer.set_exception(e)
+        
+        threading.Thread(target=run, name='scraper-producer', daemon=True).start()
+    try:
+        while True:
+            item = pages.get()
+            if item is _PRODUCER_DONE:
+                break
+            source, records = item
+            for record in records:
+                yield source, record
+        producer.result()
+    finally:
+        stopped.set()
+
+def iter_hackathons(fingerprints=None, near_duplicates=None, sources=None, metrics=None,
+                    parse_workers=None, **scrape_options):
+    """
+    Yield parsed, deduplicated hackathon documents as cards are scraped.
+    
+    Every source runs concurrently and their records are merged through one
+    normalisation and dedupe stage. sources defaults to build_sources(), with
+    a urls option replacing their listing pages. Cards whose fingerprint is
+    already in the fingerprints index are counted as unchanged and not parsed
+    again. near_duplicates turns on MinHash title matching in the dedupe stage.
+    Per-card outcomes are counted in metrics rather than printed. Parsing
+    runs on parse_workers processes (default PARSE_WORKERS, see iter_parsed).
+    """
+    metrics = metrics or ScrapeMetrics()
+    urls = scrape_options.pop('urls', None)
+    sources = sources or build_sources(urls=urls)
+    ignore_urls = [url for source in sources for url in source.ignore_urls()]
+    dedupe = DedupeIndex(ignore_urls=ignore_urls, near_duplicates=near_duplicates)
+    seen_count = 0
+    unchanged_count = 0
+    unique_count = 0
+    
+    def changed_records():
+        nonlocal seen_count, unchanged_count
+        for source, record in iter_source_records(sources, metrics=metrics, **scrape_options):
+            seen_count += 1
+            try:
+                phase_start = time.perf_counter()
+                fingerprint = source.fingerprint(record)
+                metrics.record_phase('parsing', phase_start)
+            except Exception as e:
+                metrics.error('parsing', e)
+                continue
+            if fingerprints and fingerprints.seen(fingerprint):
+                unchanged_count += 1
+                continue
+            yield source, record, fingerprint
+    
+    for (_, _, fingerprint), hackathon_info, error in iter_parsed(
+        changed_records(), parse_workers, metrics=metrics
+    ):
+        if error:
+            metrics.error('parsing', error)
+            continue
+        if not hackathon_info:
+            metrics.count('dropped')
+            continue
+        metrics.count('parsed')
+        hackathon_info['contentHash'] = fingerprint
+        
+        # Skip duplicates by normalised title and canonical URL
+        if dedupe.add(hackathon_info):
+            unique_count += 1
+            yield hackathon_info
+        else:
+            metrics.count('deduped')
+    
+    metrics.count('seen', seen_count)
+    metrics.count('unchanged', unchanged_count)
+    print(f"\n Scraped {unique_count} new or changed hackathons from {seen_count} cards!")
+    print(f"  Unchanged: {unchanged_count} cards skipped by fingerprint")
+
+def scrape_hackathons(urls=None, concurrency=None, host_interval=None, readiness=None,
+                      profile=None, screenshot=None, fetch_mode=None, fingerprints=None,
+                      near_duplicates=None, sources=None, metrics=None, parse_workers=None):
+    """
+    Scrape hackathon data from every source with improved card detection.
+    
+    urls defaults to SCRAPER_PAGES pages of each source's listing URL.
+    readiness picks how page readiness is detected: 'networkidle', 'stable'
+    (card count stops changing) or 'mutation' (DOM stops mutating). profile
+    is 'lean' (blocks images, media, fonts and trackers) or 'full'.
+    fetch_mode is 'browser', 'capture' or 'api' (see FETCH_MODES).
+    fingerprints is an index from open_fingerprint_index used to skip
+    unchanged cards. sources is a list of Source instances. metrics, a
+    ScrapeMetrics, collects the run's timings and counters. parse_workers
+    is the number of parsing processes (see iter_parsed).
+    """
+    return list(iter_hackathons(
+        fingerprints, near_duplicates, sources, metrics, parse_workers, urls=urls, concurrency=concurrency,
+        host_interval=host_interval, readiness=readiness, profile=profile,
+        screenshot=screenshot, fetch_mode=fetch_mode
+    ))
+
+def run_pipeline(batch_size=None, backup_path=BACKUP_PATH, fingerprints=None, metrics=None,
+                 enrich=None, **scrape_options):
+    """
+    Scrape, parse, dedupe and write hackathons in one streaming pass.
+    
+    Documents are flushed every batch_size records, to the gzip JSON Lines
+    backup first and then to MongoDB, while the browser is still scraping; a crash
+    mid-run keeps every batch flushed before it. If MongoDB is unreachable the
+    backup is still written. With enrich (default ENRICH_DETAILS) estimated
+    fields are filled in from detail pages before writing. The run's metrics
+    are emitted at the end. Returns the number of documents saved.
+    """
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    metrics = metrics or ScrapeMetrics()
+    enrich = ENRICH_DETAILS if enrich is None else enrich
+    sources = scrape_options.pop('sources', None) or build_sources(urls=scrape_options.pop('urls', None))
+    writer = None
+    try:
+        writer = MongoBatchWriter(get_hackathons_collection(), batch_size)
+    except Exception as e:
+        print(f"[WARN] MongoDB unavailable ({type(e).__name__}), writing the backup only")
+    
+    os.makedirs(os.path.dirname(backup_path) or '.', exist_ok=True)
+    batch = []
+    backed_up = 0
+    
+    def flush():
+        nonlocal backed_up
+        if not batch:
+            return
+        for hackathon in batch:
+            backup.write(json.dumps(hackathon, ensure_ascii=False, cls=MongoJSONEncoder) + '\n')
+        # A sync flush, so everything flushed so far survives a crash mid-run
+        backup.flush()
+        backed_up += len(batch)
+        if writer:
+            failed_before = writer.skipped
+            phase_start = time.perf_counter()
+            for hackathon in batch:
+                writer.add(hackathon)
+            writer.flush()
+            metrics.record_phase('db_write', phase_start)
+            # Only remember fingerprints once their documents are stored
+            if fingerprints and writer.skipped == failed_before:
+                fingerprints.commit(h['contentHash'] for h in batch)
+        batch.clear()
+    
+    with gzip.open(backup_path, 'at', encoding='utf-8') as backup:
+        hackathons = iter_hackathons(fingerprints, sources=sources, metrics=metrics, **scrape_options)
+        if enrich:
+            hackathons = iter_enriched(
+                hackathons, sources, scrape_options.get('session'),
+                host_interval=scrape_options.get('host_interval'), metrics=metrics
+            )
+        for hackathon in hackathons:
+            batch.append(hackathon)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    
+    if fingerprints:
+        fingerprints.commit([])
+    print(f"Data also appended to {backup_path} ({backed_up} records)")
+    if not writer:
+        metrics.emit()
+        return 0
+    writer.print_summary()
+    metrics.count('written', writer.inserted + writer.updated)
+    metrics.count('write_failed', writer.skipped)
+    metrics.emit()
+    return writer.inserted + writer.updated
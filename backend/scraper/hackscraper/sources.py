@@ -0,0 +1,136 @@
+"""
+The listing sites hackathons are scraped from and their registry.
+"""
+import abc
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+from .browser import (
+    BROWSER_PROFILE_DIR, CARD_SELECTORS, CARD_TITLE_SELECTORS, SCRAPER_PAGES, TARGET_URL,
+    build_listing_urls, produce_card_records
+)
+from .dedupe import canonical_url, card_fingerprint
+from .parsing import DETAIL_FIELDS, build_hackathon_info, build_hackathon_info_from_api, parse_detail_html
+
+# Seconds a single source may run before it is cancelled, and the sources
+# scraped when none are named
+SOURCE_TIMEOUT = float(os.getenv('SCRAPER_SOURCE_TIMEOUT', '900'))
+SCRAPER_SOURCES = os.getenv('SCRAPER_SOURCES', 'unstop')
+
+# Unstop's per-competition API, keyed by the id that ends every listing link
+UNSTOP_DETAIL_API_URL = os.getenv('UNSTOP_DETAIL_API_URL', 'https://unstop.com/api/public/competition/{id}')
+UNSTOP_ID_PATTERN = re.compile(r'-(\d{4,})/?$')
+
+class Source(abc.ABC):
+    """
+    A listing site hackathons are scraped from.
+    
+    A source bundles its fetch strategy (fetch), how its cards are extracted
+    (card_selectors, title_selectors) and how a raw card record maps onto a
+    hackathon document (map_record, which every subclass must define). The
+    default fetch renders the listing pages in the browser; subclasses
+    override whatever their site needs. urls replaces the listing pages
+    built from listing_url.
+    """
+    name = None
+    organizer = None
+    listing_url = None
+    card_selectors = CARD_SELECTORS
+    title_selectors = CARD_TITLE_SELECTORS
+
+    def __init__(self, urls=None, timeout=None):
+        self.urls = list(urls) if urls else build_listing_urls(self.listing_url, SCRAPER_PAGES)
+        self.timeout = timeout or SOURCE_TIMEOUT
+
+    def ignore_urls(self):
+        """Links that point at a listing rather than one hackathon"""
+        return list(self.urls)
+
+    def browser_profile(self):
+        """This source's own persistent browser profile directory, or '' when profiles are off"""
+        return os.path.join(BROWSER_PROFILE_DIR, self.name) if BROWSER_PROFILE_DIR else ''
+
+    async def fetch(self, emit, session=None, **scrape_options):
+        """Scrape the listing pages, passing each page's raw records to emit"""
+        scrape_options['fetch_mode'] = 'browser'
+        scrape_options.setdefault('browser_profile', self.browser_profile())
+        await produce_card_records(
+            emit, urls=self.urls, session=session, card_selectors=self.card_selectors,
+            title_selectors=self.title_selectors, **scrape_options
+        )
+
+    def fingerprint(self, record):
+        return card_fingerprint(record)
+
+    @abc.abstractmethod
+    def map_record(self, record):
+        """Turn a raw record into a hackathon document, or None to drop it"""
+
+    def detail_url(self, hackathon):
+        """URL whose response fills in the hackathon's estimated fields, or None"""
+        link = (hackathon.get('links') or {}).get('website')
+        if not link or canonical_url(link) in {canonical_url(url) for url in self.ignore_urls()}:
+            return None
+        return link
+
+    def parse_detail(self, body, content_type):
+        """Fields read from a detail page response"""
+        return parse_detail_html(body)
+
+# Registered Source subclasses by name
+SOURCES = {}
+
+def register_source(cls):
+    """Class decorator adding a Source subclass to SOURCES"""
+    SOURCES[cls.name] = cls
+    return cls
+
+@register_source
+class UnstopSource(Source):
+    """Unstop hackathon listings, read from the page, its captured API calls or the API itself"""
+    name = 'unstop'
+    organizer = 'Unstop'
+    listing_url = TARGET_URL
+
+    def ignore_urls(self):
+        return super().ignore_urls() + ['https://unstop.com/hackathons']
+
+    async def fetch(self, emit, session=None, **scrape_options):
+        scrape_options.setdefault('browser_profile', self.browser_profile())
+        await produce_card_records(emit, urls=self.urls, session=session, **scrape_options)
+
+    def map_record(self, record):
+        return build_hackathon_info(record)
+
+    def detail_url(self, hackathon):
+        # Listing links end in the competition id, which the detail API takes
+        link = super().detail_url(hackathon)
+        match = link and UNSTOP_ID_PATTERN.search(urlsplit(link).path)
+        return UNSTOP_DETAIL_API_URL.format(id=match.group(1)) if match else link
+
+    def parse_detail(self, body, content_type):
+        if 'json' not in content_type:
+            return super().parse_detail(body, content_type)
+        data = (json.loads(body) or {}).get('data') or {}
+        item = data.get('competition') or data
+        hackathon = build_hackathon_info_from_api(item) if item.get('title') else None
+        if not hackathon:
+            return {}
+        return {name: hackathon[name] for name in DETAIL_FIELDS if name not in hackathon['estimatedFields']}
+
+def build_sources(names=None, urls=None):
+    """
+    Instantiate the named sources (default SCRAPER_SOURCES, comma-separated).
+    
+    urls, when given, replaces the listing pages of every source built.
+    """
+    if names is None:
+        names = SCRAPER_SOURCES
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown source: {', '.join(unknown)}")
+    return [SOURCES[name](urls) for name in names]
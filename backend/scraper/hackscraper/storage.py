@@ -0,0 +1,375 @@
+"""
+MongoDB storage, the dataset export and status maintenance. pymongo and bson
+are imported on first use, so importing this module stays cheap.
+"""
+import json
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from .dataset_export import BACKUP_PATH, SNAPSHOT_PATH, iter_jsonl_gz, latest_documents, write_snapshot
+from .parsing import STATUS_END_FIELDS, STATUS_START_FIELDS
+
+# Custom JSON encoder for MongoDB ObjectId and datetime
+class MongoJSONEncoder(json.JSONEncoder):
+    def default(self, o):
+        from bson import ObjectId
+        if isinstance(o, ObjectId):
+            return str(o)
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+# Default number of upserts sent per bulk_write round-trip
+DEFAULT_BATCH_SIZE = int(os.getenv('SCRAPER_BATCH_SIZE', '500'))
+
+def ensure_indexes(collection):
+    """
+    Create the unique title + website index the upserts rely on, plus the
+    fingerprint index and the date and status indexes recompute_statuses queries
+    """
+    from pymongo import ASCENDING
+    from pymongo.errors import OperationFailure
+    try:
+        collection.create_index(
+            [('title', ASCENDING), ('links.website', ASCENDING)],
+            unique=True,
+            name='title_website_unique'
+        )
+    except OperationFailure as e:
+        # Existing duplicate documents prevent the unique build; upserts still
+        # work, they just fall back to a collection scan until cleaned up
+        print(f"[WARN] Could not create unique index: {str(e)[:80]}")
+    try:
+        collection.create_index('contentHash', name='content_hash')
+        for field in STATUS_END_FIELDS:
+            collection.create_index(field, name=f"{field}_1")
+        collection.create_index('status', name='status_1')
+    except OperationFailure as e:
+        # An existing index with other options under the same name; queries
+        # still work without these, only slower
+        print(f"[WARN] Could not create lookup indexes: {str(e)[:80]}")
+
+# Fields stored as BSON dates, so the model's Date fields and range queries
+# on them work; the scraper builds them as ISO strings
+STORED_DATE_FIELDS = ('startDate', 'endDate', 'registrationDeadline', 'scraped_at')
+
+def to_stored_date(value):
+    """An ISO date/time string as a naive UTC datetime; anything else unchanged"""
+    if not isinstance(value, str):
+        return value
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def build_upsert_op(hackathon, now):
+    """Build the (filter, UpdateOne) upsert for a hackathon, or None to skip it"""
+    from pymongo import UpdateOne
+    # Sanitize title
+    title = hackathon.get('title', '')
+    if not title or len(title) > 500:
+        return None
+
+    # Build dedupe query: title + website when available
+    query = {'title': title}
+    website = (hackathon.get('links') or {}).get('website')
+    if website:
+        # Validate URL
+        if website.startswith(('http://', 'https://')):
+            query['links.website'] = website
+
+    return query, UpdateOne(
+        query,
+        {
+            '$set': {
+                **hackathon,
+                **{f: to_stored_date(hackathon[f]) for f in STORED_DATE_FIELDS if f in hackathon},
+                'updatedAt': now
+            },
+            '$setOnInsert': {
+                'createdAt': now
+            }
+        },
+        upsert=True
+    )
+
+def write_batch(collection, ops):
+    """Send one unordered bulk_write and return (inserted, updated, failed)"""
+    from pymongo.errors import BulkWriteError
+    try:
+        result = collection.bulk_write(ops, ordered=False)
+        return result.upserted_count, result.matched_count, 0
+    except BulkWriteError as e:
+        # Unordered writes keep going past failures; count what did land
+        details = e.details
+        write_errors = details.get('writeErrors', [])
+        for error in write_errors[:3]:
+            print(f" Error: {str(error.get('errmsg', ''))[:80]}")
+        return details.get('nUpserted', 0), details.get('nMatched', 0), len(write_errors)
+
+# One pooled client shared by every save in the process, and how long it
+# waits for a server before giving up
+MONGO_POOL_SIZE = int(os.getenv('SCRAPER_MONGO_POOL_SIZE', '10'))
+MONGO_TIMEOUT_MS = int(os.getenv('SCRAPER_MONGO_TIMEOUT_MS', '5000'))
+_mongo_client = None
+_mongo_indexed = False
+_mongo_lock = threading.Lock()
+
+def _mongodb_hosts(uri):
+    """(host, port) pairs of a mongodb:// URI, or None when only the driver can resolve them"""
+    if not uri.startswith('mongodb://'):
+        return None  # mongodb+srv looks its hosts up in DNS
+    netloc = uri[len('mongodb://'):].split('/', 1)[0].split('?', 1)[0].rpartition('@')[2]
+    hosts = []
+    for host in netloc.split(','):
+        if host.startswith('['):
+            name, _, port = host[1:].partition(']')
+            port = port[1:]
+        else:
+            name, _, port = host.partition(':')
+        if not name or '%' in name or name.endswith('.sock') or not (port or '27017').isdigit():
+            return None  # Unix sockets and malformed hosts are left to the driver
+        hosts.append((name, int(port or 27017)))
+    return hosts
+
+def wait_for_mongodb(uri, timeout_ms=MONGO_TIMEOUT_MS):
+    """
+    Raise ConnectionError unless a host in uri accepts a TCP connection
+    within timeout_ms, retrying like the driver's server selection does.
+    Run before pymongo is imported, so an unreachable server fails (and
+    export falls back to the backup) without the driver's import time.
+    """
+    hosts = _mongodb_hosts(uri)
+    if not hosts:
+        return
+    deadline = time.monotonic() + timeout_ms / 1000
+    while True:
+        for host in hosts:
+            try:
+                socket.create_connection(host, timeout=max(deadline - time.monotonic(), 1)).close()
+                return
+            except OSError as e:
+                error = e
+        if time.monotonic() >= deadline:
+            raise ConnectionError(f"No MongoDB server reachable at {uri.rpartition('@')[2]}: {error}")
+        time.sleep(min(0.25, max(deadline - time.monotonic(), 0)))
+
+def get_hackathons_collection():
+    """
+    Return the hackathons collection on the shared MongoClient.
+    
+    The client is created, pinged and indexed on first use only; later calls
+    reuse its connection pool. Raises if MongoDB is unreachable.
+    """
+    global _mongo_client, _mongo_indexed
+    with _mongo_lock:
+        if _mongo_client is None:
+            mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017')
+            
+            # Validate URI
+            if not mongodb_uri or not mongodb_uri.startswith('mongodb'):
+                raise ValueError("Invalid MongoDB URI")
+            
+            wait_for_mongodb(mongodb_uri)
+            from pymongo import MongoClient
+            client = MongoClient(mongodb_uri, serverSelectionTimeoutMS=MONGO_TIMEOUT_MS, maxPoolSize=MONGO_POOL_SIZE)
+            try:
+                # Test connection
+                client.admin.command('ping')
+            except Exception:
+                client.close()
+                raise
+            _mongo_client = client
+        
+        collection = _mongo_client['hackplanner']['hackathons']
+        if not _mongo_indexed:
+            ensure_indexes(collection)
+            _mongo_indexed = True
+        return collection
+
+def close_mongo_client():
+    """Close the shared MongoClient, if one was opened"""
+    global _mongo_client, _mongo_indexed
+    with _mongo_lock:
+        if _mongo_client is not None:
+            _mongo_client.close()
+            _mongo_client = None
+            _mongo_indexed = False
+
+class MongoBatchWriter:
+    """Buffers hackathon upserts and sends them as unordered bulk_write batches"""
+
+    def __init__(self, collection, batch_size=None):
+        self.collection = collection
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        # Keyed on the upsert filter so repeats inside one batch collapse to
+        # the last copy instead of racing each other in an unordered write
+        self.pending = {}
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+
+    def add(self, hackathon):
+        built = build_upsert_op(hackathon, datetime.utcnow())
+        if built is None:
+            self.skipped += 1
+            return
+        query, op = built
+        key = tuple(sorted(query.items()))
+        if key in self.pending:
+            # Same outcome as the second of two sequential upserts
+            self.updated += 1
+        self.pending[key] = op
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        ops = list(self.pending.values())
+        self.pending = {}
+        inserted, updated, failed = write_batch(self.collection, ops)
+        self.inserted += inserted
+        self.updated += updated
+        self.skipped += failed
+
+    def print_summary(self):
+        print(f"\n Summary:")
+        print(f"  Inserted: {self.inserted} new hackathons")
+        print(f" Updated: {self.updated} existing hackathons")
+        print(f"  Skipped: {self.skipped} due to errors")
+
+def save_to_mongodb(hackathon_data, batch_size=None, collection=None):
+    """
+    Save scraped hackathon data to MongoDB with duplicate prevention.
+    
+    collection defaults to the hackathons collection on the shared client.
+    """
+    try:
+        if collection is None:
+            collection = get_hackathons_collection()
+        writer = MongoBatchWriter(collection, batch_size)
+        for hackathon in hackathon_data:
+            writer.add(hackathon)
+        writer.flush()
+        writer.print_summary()
+        
+        return writer.inserted + writer.updated
+        
+    except ConnectionError:
+        print("MongoDB connection error: Could not connect to database")
+        return 0
+    except ValueError as e:
+        print(f"Configuration error: {str(e)}")
+        return 0
+    except Exception as e:
+        # Only imported once something failed, so the preflight's failure
+        # above never loads pymongo
+        from pymongo.errors import ConnectionFailure
+        if isinstance(e, ConnectionFailure):
+            print("MongoDB connection error: Could not connect to database")
+        else:
+            print(f"Error saving to MongoDB: {type(e).__name__}")
+        return 0
+
+def export_dataset(path=SNAPSHOT_PATH, fmt=None, backup_path=BACKUP_PATH):
+    """
+    Write a columnar snapshot of every stored hackathon and return its format.
+    
+    Documents come from MongoDB, or from the latest copy of each hackathon in
+    the gzip backup when MongoDB is unreachable.
+    """
+    try:
+        collection = get_hackathons_collection()
+        hackathons = list(collection.find({}, {'_id': 0}))
+        origin = 'MongoDB'
+    except Exception as e:
+        print(f"[WARN] MongoDB unavailable ({type(e).__name__}), exporting from {backup_path}")
+        if not os.path.exists(backup_path):
+            print(f"[ERROR] No backup at {backup_path}")
+            return None
+        hackathons = latest_documents(iter_jsonl_gz(backup_path))
+        origin = backup_path
+    fmt = write_snapshot(hackathons, path, fmt)
+    print(f"[OK] Exported {len(hackathons)} hackathons from {origin} to {path} ({fmt})")
+    return fmt
+
+def _first_date_matches(fields, condition):
+    """Query for documents whose first set field of fields meets condition"""
+    return {'$or': [
+        {**{earlier: None for earlier in fields[:i]}, field: condition}
+        for i, field in enumerate(fields)
+    ]}
+
+def status_queries(now):
+    """The query matching each status's documents as of now (a UTC datetime)"""
+    today = datetime(now.year, now.month, now.day)
+    tomorrow = today + timedelta(days=1)
+    # Disjoint, so repeated runs never flip a document back and forth; an
+    # end before the start counts as completed, as it does at scrape time
+    not_ended = _first_date_matches(STATUS_END_FIELDS, {'$gte': today})
+    return {
+        'upcoming': {'$and': [_first_date_matches(STATUS_START_FIELDS, {'$gte': tomorrow}), not_ended]},
+        'ongoing': {'$and': [_first_date_matches(STATUS_START_FIELDS, {'$lt': tomorrow}), not_ended]},
+        'completed': _first_date_matches(STATUS_END_FIELDS, {'$lt': today})
+    }
+
+def convert_string_dates(collection, fields=STATUS_END_FIELDS):
+    """Convert fields still stored as strings to BSON dates, server-side"""
+    converted = 0
+    for field in fields:
+        # Unparseable strings are left as they are
+        result = collection.update_many(
+            {field: {'$type': 'string'}},
+            [{'$set': {field: {'$dateFromString': {'dateString': f"${field}", 'onError': f"${field}"}}}}]
+        )
+        converted += result.modified_count
+    return converted
+
+def recompute_statuses(collection=None, now=None, migrate_dates=False):
+    """
+    Bring every stored status in line with its dates, in a few update_many calls.
+    
+    Each status is one range query over the indexed date fields (same rules
+    as determine_hackathon_status), restricted to documents not already in
+    that status, so a run only writes what changed and is cheap to repeat.
+    Any document still outside the model's enum afterwards (a legacy
+    closed/closing_soon with no usable dates) becomes upcoming, which is what
+    determine_hackathon_status says for an undated document. String status
+    dates are converted to BSON dates first; migrate_dates converts every
+    stored date field, scraped_at included, for documents saved before
+    upserts stored BSON dates (a one-off). Returns the number of documents
+    changed per status and from an unknown status, plus the date fields
+    converted.
+    """
+    collection = collection if collection is not None else get_hackathons_collection()
+    now = now or datetime.utcnow()
+    date_fields = STORED_DATE_FIELDS if migrate_dates else STATUS_END_FIELDS
+    report = {'dates_converted': convert_string_dates(collection, date_fields)}
+    
+    queries = status_queries(now)
+    for status, query in queries.items():
+        result = collection.update_many(
+            {'$and': [query, {'status': {'$ne': status}}]},
+            {'$set': {'status': status, 'updatedAt': now}}
+        )
+        report[status] = result.modified_count
+    # Runs last, so it only catches what no date query matched
+    result = collection.update_many(
+        {'status': {'$nin': list(queries)}},
+        {'$set': {'status': 'upcoming', 'updatedAt': now}}
+    )
+    report['unknown_status'] = result.modified_count
+    
+    changed = sum(report[status] for status in queries) + report['unknown_status']
+    print(f"[OK] Status recomputed: {changed} changed "
+          f"({', '.join(f'{report[s]} {s}' for s in queries)}, "
+          f"{report['unknown_status']} unknown statuses set to upcoming), "
+          f"{report['dates_converted']} string dates converted")
+    return report
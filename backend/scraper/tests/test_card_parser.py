@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+
+from bench_card_parser import baseline_parse, load_corpus
+from hackscraper.parsing import CARD_PARSER, DEFAULT_TEAM_SIZE, CardParser
+
+NOW = datetime(2026, 1, 1)
+
+@pytest.mark.parametrize('text, category', [
+    # Short keywords only match whole words
+    ("What's happening this weekend", "Other"),
+    ("Build week for students", "Other"),
+    ("Ship an app in a day", "Mobile Development"),
+    ("UI sprint", "Design"),
+    ("Apps and APIs", "Mobile Development"),
+    # Longer keywords still match as word prefixes
+    ("Cybersecurity capture the flag", "Cybersecurity"),
+    # The first keyword in CATEGORIES_MAP wins, wherever it appears in the text
+    ("Web3 security meets machine learning", "AI/ML"),
+    ("Design a blockchain game", "Blockchain"),
+])
+def test_category(text, category):
+    assert CARD_PARSER.parse(text)['category'] == category
+    assert CARD_PARSER.category(text) == category
+
+def test_team_size_wins_over_members():
+    fields = CARD_PARSER.parse("1 - 4 Members, Team size: 2-6")
+    assert fields['team_size'] == {'min': 2, 'max': 6}
+
+def test_members_and_single_sizes():
+    assert CARD_PARSER.parse("team of 3, 1-3 members")['team_size'] == {'min': 1, 'max': 3}
+    assert CARD_PARSER.parse("Team size: 4")['team_size'] == {'min': 4, 'max': 4}
+    assert CARD_PARSER.parse("no size given")['team_size'] == DEFAULT_TEAM_SIZE
+
+def test_first_deadline_and_prize_win():
+    fields = CARD_PARSER.parse("3 days left ₹25,000 then 9 days left ₹1,000", now=NOW)
+    assert fields['deadline'] == '2026-01-04'
+    assert fields['prize'] == '₹25,000'
+
+def test_closed_markers():
+    assert CARD_PARSER.parse("Registration closed")['closed']
+    assert not CARD_PARSER.parse("Registration open, 2 days left")['closed']
+
+def test_custom_categories_map():
+    parser = CardParser({'Rust': 'Systems'})
+    assert parser.parse("rust hackathon")['category'] == 'Systems'
+    assert parser.parse("trust fall")['category'] == 'Other'
+
+@pytest.mark.parametrize('text', load_corpus())
+def test_parity_with_previous_regexes(text):
+    deadline, prize_match, location = baseline_parse(text)
+    fields = CARD_PARSER.parse(text)
+    assert fields['deadline'] == deadline
+    assert fields['prize'] == (f"₹{prize_match.group(1)}" if prize_match else None)
+    assert fields['location'] == location
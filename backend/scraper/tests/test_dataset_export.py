@@ -0,0 +1,67 @@
+import pytest
+
+from hackscraper.dataset_export import SnapshotReader, write_snapshot
+
+def hackathon(i, city=None):
+    return {
+        'title': f"Hackathon {i}",
+        'organizer': "IIT Delhi",
+        'category': 'AI/ML' if i % 2 else 'Web Development',
+        'status': 'upcoming' if i % 3 else 'completed',
+        'source': 'unstop',
+        'location': {'type': 'offline', 'address': {'city': city or f"City {i % 4}"}},
+        'registrationDeadline': f"2026-02-{i % 28 + 1:02d}",
+        'startDate': '2026-03-01',
+        'links': {'website': f"https://unstop.com/hackathons/h-{i}"},
+        'prizes': [{'amount': 1000 * i}, {'amount': 'n/a'}],
+        'teamSize': {'min': 1, 'max': 4},
+        'contentHash': f"hash{i}"
+    }
+
+@pytest.fixture
+def soa_path(tmp_path):
+    path = str(tmp_path / 'hackathons.snapshot')
+    assert write_snapshot([hackathon(i) for i in range(60)], path, 'soa') == 'soa'
+    return path
+
+def test_soa_round_trip(soa_path):
+    with SnapshotReader(soa_path) as reader:
+        assert reader.format == 'soa'
+        assert len(reader) == 60
+        row = next(reader.rows([7]))
+        assert row['title'] == "Hackathon 7"
+        assert row['city'] == "City 3"
+        assert row['registrationDeadline'] == '2026-02-08'
+        assert row['endDate'] is None
+        assert row['prizeTotal'] == 7000
+        assert (row['teamMin'], row['teamMax']) == (1, 4)
+
+def test_soa_filter(soa_path):
+    with SnapshotReader(soa_path) as reader:
+        matches = reader.filter(category='AI/ML', status='upcoming',
+                                deadline_after='2026-02-05', deadline_before='2026-02-10')
+        expected = [i for i in range(60) if i % 2 and i % 3 and 4 <= i % 28 <= 9]
+        assert matches == expected
+        assert [row['title'] for row in reader.rows(matches, ['title'])] == [f"Hackathon {i}" for i in expected]
+        assert reader.filter(status=['upcoming', 'completed']) == list(range(60))
+
+def test_soa_wide_dictionary(tmp_path):
+    # Past 65536 distinct values the codes no longer fit in uint16
+    path = str(tmp_path / 'wide.snapshot')
+    count = (1 << 16) + 10
+    write_snapshot([hackathon(i, city=f"c{i}") for i in range(count)], path, 'soa')
+    with SnapshotReader(path) as reader:
+        assert reader.header['columns']['city']['typecode'] == 'I'
+        assert reader.header['columns']['category']['typecode'] == 'H'
+        rows = reader.rows([0, 1 << 16, count - 1], ['city'])
+        assert [row['city'] for row in rows] == ['c0', f"c{1 << 16}", f"c{count - 1}"]
+
+def test_close_with_live_generator(soa_path):
+    reader = SnapshotReader(soa_path)
+    rows = reader.rows()
+    next(rows)
+    reader.filter(category='AI/ML')
+    reader.close()
+    with SnapshotReader(soa_path) as reader:
+        rows = reader.rows()
+        assert next(rows)['title'] == "Hackathon 0"
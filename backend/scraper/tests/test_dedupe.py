@@ -0,0 +1,55 @@
+import pytest
+
+from hackscraper.dedupe import DedupeIndex, canonical_url, strip_tracking_params
+
+def hackathon(title, website=None):
+    return {'title': title, 'links': {'website': website} if website else {}}
+
+@pytest.mark.parametrize('first, second', [
+    ("Smart India Hackathon 2025", "Smart India Hackathon 2026"),
+    ("HackMIT 2025", "HackMIT 2026"),
+    ("HackHeritage 2.0", "HackHeritage 3.0"),
+])
+def test_near_duplicates_keep_other_editions(first, second):
+    index = DedupeIndex(near_duplicates=True)
+    assert index.add(hackathon(first))
+    assert index.add(hackathon(second))
+
+def test_near_duplicates_drop_reposts():
+    index = DedupeIndex(near_duplicates=True)
+    assert index.add(hackathon("Smart India Hackathon 2026"))
+    assert not index.add(hackathon("Smart India Hackathon 2026!"))
+    assert not index.add(hackathon("Smart-India Hackathon 2026"))
+
+def test_exact_title_and_url_duplicates():
+    index = DedupeIndex(ignore_urls=['https://unstop.com/hackathons'])
+    assert index.add(hackathon("Alpha Hack", 'https://unstop.com/hackathons/alpha-1?utm_source=x'))
+    assert not index.add(hackathon("  alpha   HACK "))
+    assert not index.add(hackathon("Renamed Alpha", 'https://www.unstop.com/hackathons/alpha-1/'))
+    # The listing page itself is never an identity
+    assert index.add(hackathon("Bravo", 'https://unstop.com/hackathons'))
+    assert index.add(hackathon("Charlie", 'https://unstop.com/hackathons'))
+
+def test_urls_differing_in_identifying_params_are_distinct():
+    index = DedupeIndex()
+    assert index.add(hackathon("One", 'https://example.com/event?id=1'))
+    assert index.add(hackathon("Two", 'https://example.com/event?id=2'))
+
+@pytest.mark.parametrize('url, key', [
+    ('https://www.Unstop.com/h/x/?b=2&utm_source=a&a=1&lb=z#top', 'unstop.com/h/x?a=1&b=2'),
+    ('http://unstop.com/h/x', 'unstop.com/h/x'),
+    ('https://unstop.com/h/x?fbclid=1&gclid=2', 'unstop.com/h/x'),
+    ('/relative/path', None),
+    ('', None),
+    (None, None),
+])
+def test_canonical_url(url, key):
+    assert canonical_url(url) == key
+
+@pytest.mark.parametrize('url, stripped', [
+    ('https://unstop.com/h?x=1&utm_medium=y&ref=z', 'https://unstop.com/h?x=1'),
+    ('https://unstop.com/h?lb=abc', 'https://unstop.com/h'),
+    ('https://unstop.com/h?b=2&a=1#frag', 'https://unstop.com/h?b=2&a=1#frag'),
+])
+def test_strip_tracking_params(url, stripped):
+    assert strip_tracking_params(url) == stripped
@@ -0,0 +1,38 @@
+from hackscraper.enrich import merge_detail
+from hackscraper.parsing import (
+    DEFAULT_TEAM_SIZE, build_hackathon_info, build_hackathon_info_from_api, parse_detail_html
+)
+
+DETAIL_PAGE = """<html><head><meta name="description" content="A weekend of building."></head>
+<body><h1>Alpha Hack</h1><p>Team size: 2-4</p><p>Prize ₹1,00,000</p></body></html>"""
+
+def test_detail_page_fills_team_size_and_prizes():
+    hackathon = build_hackathon_info({
+        'text': "Alpha Hack\nHeritage Institute of Technology 12 days left",
+        'titles': ["Alpha Hack"],
+        'href': '/hackathons/alpha-hack-1234567',
+        'page_url': 'https://unstop.com/hackathons'
+    })
+    assert hackathon['teamSize'] == DEFAULT_TEAM_SIZE
+    assert hackathon['prizes'] == []
+    assert {'teamSize', 'prizes'} <= set(hackathon['estimatedFields'])
+
+    merge_detail(hackathon, parse_detail_html(DETAIL_PAGE))
+    assert hackathon['teamSize'] == {'min': 2, 'max': 4}
+    assert hackathon['prizes'][0]['amount'] == 100000
+    assert hackathon['description'] == "A weekend of building."
+    assert not {'teamSize', 'prizes', 'description'} & set(hackathon['estimatedFields'])
+
+def test_listing_values_are_not_overwritten():
+    hackathon = build_hackathon_info({
+        'text': "Alpha Hack\nHeritage Institute of Technology 12 days left Team size: 1-3",
+        'titles': ["Alpha Hack"]
+    })
+    merge_detail(hackathon, parse_detail_html(DETAIL_PAGE))
+    assert hackathon['teamSize'] == {'min': 1, 'max': 3}
+
+def test_api_items_mark_missing_team_size_and_prizes():
+    item = {'title': "Bravo Challenge", 'public_url': 'hackathons/bravo-7654321', 'regnRequirements': {}}
+    assert {'teamSize', 'prizes'} <= set(build_hackathon_info_from_api(item)['estimatedFields'])
+    item.update(regnRequirements={'min_team_size': 1, 'max_team_size': 4}, prizes=[{'cash': 5000}])
+    assert not {'teamSize', 'prizes'} & set(build_hackathon_info_from_api(item)['estimatedFields'])
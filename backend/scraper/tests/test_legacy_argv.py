@@ -0,0 +1,21 @@
+import pytest
+
+from unstop_scraper import legacy_argv
+
+@pytest.mark.parametrize('argv, command', [
+    ([], ['scrape']),
+    (['--sources', 'unstop', '--daemon'], ['scrape', '--sources', 'unstop', '--daemon']),
+    (['--recompute-status'], ['recompute-status']),
+    (['--export'], ['export']),
+    (['--export', 'out.snapshot'], ['export', 'out.snapshot']),
+    (['--export', '--export-format', 'soa'], ['export', '--format', 'soa']),
+    (['--export-format', 'soa', '--export', 'out.snapshot'], ['export', 'out.snapshot', '--format', 'soa']),
+])
+def test_legacy_argv(argv, command):
+    assert legacy_argv(argv) == command
+
+def test_export_format_without_value_is_a_usage_error(capsys):
+    with pytest.raises(SystemExit) as exited:
+        legacy_argv(['--export', '--export-format'])
+    assert exited.value.code == 2
+    assert '--export-format' in capsys.readouterr().err
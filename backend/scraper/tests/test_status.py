@@ -0,0 +1,76 @@
+from datetime import date, datetime
+from itertools import product
+
+import pytest
+
+from hackscraper.parsing import determine_hackathon_status, status_from_deadline
+from hackscraper.storage import recompute_statuses, status_queries
+
+TODAY = date(2026, 3, 10)
+NOW = datetime(2026, 3, 10, 15, 30)
+
+@pytest.mark.parametrize('dates, status', [
+    ({}, 'upcoming'),
+    ({'startDate': '2026-03-11', 'endDate': '2026-03-12'}, 'upcoming'),
+    ({'startDate': '2026-03-10', 'endDate': '2026-03-12'}, 'ongoing'),
+    ({'startDate': '2026-03-01', 'endDate': '2026-03-10'}, 'ongoing'),
+    ({'startDate': '2026-03-01', 'endDate': '2026-03-09'}, 'completed'),
+    # A missing date falls back to the first other date that is set
+    ({'registrationDeadline': '2026-03-09'}, 'completed'),
+    ({'registrationDeadline': '2026-03-10'}, 'ongoing'),
+    ({'startDate': '2026-03-05', 'registrationDeadline': '2026-03-20'}, 'completed'),
+    ({'endDate': '2026-03-20'}, 'upcoming'),
+    ({'startDate': '2026-03-05', 'endDate': '2026-03-20'}, 'ongoing'),
+    # An end before the start is completed
+    ({'startDate': '2026-03-20', 'endDate': '2026-03-01'}, 'completed'),
+    # Stored datetimes and full ISO strings count by their day
+    ({'startDate': datetime(2026, 3, 10, 23, 59)}, 'ongoing'),
+    ({'endDate': '2026-03-09T23:59:00'}, 'completed'),
+    # Unparseable dates count as missing
+    ({'startDate': 'soon', 'endDate': '2026-03-09'}, 'completed'),
+    ({'startDate': 'soon'}, 'upcoming'),
+])
+def test_determine_hackathon_status(dates, status):
+    assert determine_hackathon_status(dates, TODAY) == status
+
+@pytest.mark.parametrize('deadline, text, status', [
+    ('2026-03-20', "Register now, 10 days left", 'upcoming'),
+    ('2026-03-20', "Registration closed", 'completed'),
+    ('2026-03-01', "", 'completed'),
+    (None, "", 'upcoming'),
+])
+def test_status_from_deadline(deadline, text, status):
+    assert status_from_deadline(deadline, text, TODAY) == status
+
+# Every combination of missing, yesterday, today and tomorrow per date field
+DAYS = [None, datetime(2026, 3, 9), datetime(2026, 3, 10), datetime(2026, 3, 11, 8)]
+DOCUMENTS = [
+    {'_id': i, **{f: d for f, d in zip(('startDate', 'endDate', 'registrationDeadline'), days) if d}}
+    for i, days in enumerate(product(DAYS, repeat=3))
+]
+
+def test_status_queries_are_disjoint_and_match_scrape_time_status():
+    mongomock = pytest.importorskip('mongomock')
+    collection = mongomock.MongoClient().db.hackathons
+    collection.insert_many(DOCUMENTS)
+    matched = {}
+    for status, query in status_queries(NOW).items():
+        for document in collection.find(query, {'_id': 1}):
+            assert document['_id'] not in matched, f"{document} matches {matched.get(document['_id'])} and {status}"
+            matched[document['_id']] = status
+    for document in DOCUMENTS:
+        # Undated documents are left to the unknown-status catch-all
+        expected = determine_hackathon_status(document, TODAY) if len(document) > 1 else None
+        assert matched.get(document['_id']) == expected
+
+def test_recompute_statuses(monkeypatch):
+    mongomock = pytest.importorskip('mongomock')
+    # mongomock has no $dateFromString; the documents already hold dates
+    monkeypatch.setattr('hackscraper.storage.convert_string_dates', lambda collection, fields: 0)
+    collection = mongomock.MongoClient().db.hackathons
+    collection.insert_many([{**document, 'status': 'closing_soon'} for document in DOCUMENTS])
+    report = recompute_statuses(collection, NOW)
+    assert sum(report[s] for s in ('upcoming', 'ongoing', 'completed', 'unknown_status')) == len(DOCUMENTS)
+    for document in collection.find():
+        assert document['status'] == determine_hackathon_status(document, TODAY)
+    assert recompute_statuses(collection, NOW)['ongoing'] == 0
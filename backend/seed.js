@@ -1,7 +1,16 @@
+const fs = require('fs');
+const readline = require('readline');
+const zlib = require('zlib');
 const mongoose = require('mongoose');
 const Hackathon = require('./models/Hackathon');
 const connectDB = require('./config/db');
 
+// Optional scraper export to seed from instead of the sample data below:
+// `node seed.js scraper/data/scraped_hackathons.jsonl.gz` (or SEED_FILE)
+const seedFile = process.argv[2] || process.env.SEED_FILE;
+const SEED_BATCH_SIZE = 500;
+const DATE_FIELDS = ['startDate', 'endDate', 'registrationDeadline', 'scraped_at'];
+
 const mongoURI = 'mongodb://localhost:27017/hackplanner';
 
 const hackathonData = [
@@ -44,13 +53,41 @@ const hackathonData = [
    
 ];
 
+// Stream a scraper JSON Lines export (gzipped or not). The scraper appends
+// every run to it, so the last copy of each title + website wins. This reads
+// the history rather than the columnar snapshot, which keeps only the
+// flattened columns it filters on, not whole documents
+const loadScraperExport = async (file) => {
+    let input = fs.createReadStream(file);
+    if (file.endsWith('.gz')) {
+        input = input.pipe(zlib.createGunzip());
+    }
+    const latest = new Map();
+    for await (const line of readline.createInterface({ input, crlfDelay: Infinity })) {
+        if (!line.trim()) continue;
+        const doc = JSON.parse(line);
+        delete doc._id;
+        for (const field of DATE_FIELDS) {
+            if (doc[field]) doc[field] = new Date(doc[field]);
+        }
+        if (!Hackathon.schema.path('status').enumValues.includes(doc.status)) {
+            delete doc.status;
+        }
+        latest.set(`${doc.title}|${(doc.links || {}).website || ''}`, doc);
+    }
+    return [...latest.values()];
+};
+
 const seedDB = async () => {
     try {
+        const data = seedFile ? await loadScraperExport(seedFile) : hackathonData;
         // Ensure DB connection
         await connectDB();
         await Hackathon.deleteMany({});
-        await Hackathon.insertMany(hackathonData);
-        console.log('Database seeded successfully');
+        for (let i = 0; i < data.length; i += SEED_BATCH_SIZE) {
+            await Hackathon.insertMany(data.slice(i, i + SEED_BATCH_SIZE));
+        }
+        console.log(`Database seeded successfully (${data.length} hackathons${seedFile ? ` from ${seedFile}` : ''})`);
         mongoose.connection.close();
     } catch (error) {
         console.error('Error seeding database:', error);